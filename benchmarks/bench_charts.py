@@ -0,0 +1,51 @@
+# benchmarks/bench_charts.py
+"""Serialized size and build time of the price chart with every bar vs. `price_figure`"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard.charts import price_figure
+from models.model import generate_signals
+from services.indicators import add_indicators, indicator_columns
+
+LINES = ("SMA_20", "SMA_50", "EMA_20", "BB_Upper", "BB_Lower")
+
+def make_history(n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_bars)))
+    df = pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, n_bars)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, n_bars).astype(np.float64),
+    }, index=pd.bdate_range("1980-01-01", periods=n_bars))
+    return generate_signals(add_indicators(df, columns=indicator_columns("sma", "ema", "rsi", "macd", "bollinger")))
+
+def full_figure(df):
+    fig = go.Figure(go.Candlestick(x=df.index, open=df["Open"], high=df["High"], low=df["Low"], close=df["Close"]))
+    for column in LINES:
+        fig.add_trace(go.Scatter(x=df.index, y=df[column], name=column))
+    for side in ("BUY", "SELL"):
+        markers = df[df["Signal"] == side]
+        fig.add_trace(go.Scatter(x=markers.index, y=markers["Close"], mode="markers", name=side))
+    return fig
+
+if __name__ == "__main__":
+    # Warm up plotly's validators and the dark template
+    full_figure(make_history(300)).to_json()
+    price_figure(make_history(300), "X").to_json()
+    print(f"{'bars':>8} | {'all bars':>18} | {'bounded':>18}")
+    for years in (1, 5, 20, 40):
+        df = make_history(252 * years)
+        cells = []
+        for build in (full_figure, lambda df: price_figure(df, "X", show_bollinger=True)):
+            start = time.perf_counter()
+            payload = build(df).to_json()
+            cells.append(f"{len(payload) / 1e6:6.2f} MB {(time.perf_counter() - start) * 1e3:6.0f} ms")
+        print(f"{len(df):>8,} | {cells[0]:>18} | {cells[1]:>18}")
@@ -0,0 +1,44 @@
+# benchmarks/bench_fetch.py
+"""
+Batch fetch wall time against the local Alpha Vantage stand-in: cold
+downloads for 1, 2, 4, ... concurrent requests, then the same symbols
+served from the local cache.
+
+    python benchmarks/bench_fetch.py [symbols] [latency seconds]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# A scratch cache, so every run starts cold
+os.environ["STOCK_CACHE_DIR"] = tempfile.mkdtemp(prefix="bench_fetch_")
+
+from services.alphavantage_api import AlphaVantageClient, invalidate_cache
+from services.batch_fetch import fetch_many
+from services.mock_alphavantage import MockAlphaVantage
+
+def run(symbols, workers, url):
+    # No limiter: this measures the fetch path, not the free-tier budget
+    with AlphaVantageClient(base_url=url, pool_size=workers) as client:
+        start = time.perf_counter()
+        errors = sum(error is not None for _, _, error in fetch_many(symbols, "full", workers, client=client))
+        return time.perf_counter() - start, errors
+
+if __name__ == "__main__":
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    symbols = [f"SYM{i:03d}" for i in range(n_symbols)]
+
+    with MockAlphaVantage(fixtures=None, latency=latency) as mock:
+        print(f"{n_symbols} symbols, full history, {latency * 1e3:.0f} ms simulated latency")
+        # Build the synthetic payloads once so every round measures the same work
+        run(symbols, 8, mock.url)
+        for workers in (1, 2, 4, 8):
+            invalidate_cache()
+            elapsed, errors = run(symbols, workers, mock.url)
+            print(f"  cold, {workers} workers: {elapsed:6.2f} s  ({errors} errors)")
+        elapsed, errors = run(symbols, 8, mock.url)
+        print(f"  cached:          {elapsed:6.2f} s  ({errors} errors)")
+        print(f"  server: {mock.stats()}")
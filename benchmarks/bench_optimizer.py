@@ -0,0 +1,55 @@
+# benchmarks/bench_optimizer.py
+"""
+Parameter-sweep throughput for 1, 2, 4, ... worker processes.
+
+    python benchmarks/bench_optimizer.py [symbols] [combinations]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.optimizer import random_params, sweep
+
+N_BARS = 252 * 10
+# Wider than DEFAULT_SPACE so large combination counts are available
+SPACE = {
+    "rsi_oversold": tuple(range(20, 41)),
+    "rsi_overbought": tuple(range(60, 81)),
+    "volume_ratio": (1.0, 1.1, 1.2, 1.3, 1.5, 2.0),
+    "momentum": (0.01, 0.015, 0.02, 0.03, 0.05),
+    "min_votes": (1, 2, 3),
+}
+
+def synthetic_frames(n_symbols, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2015-01-01", periods=N_BARS)
+    return {
+        f"SYM{i:03d}": pd.DataFrame({
+            "Close": 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, N_BARS))),
+            "Volume": rng.integers(1_000_000, 5_000_000, N_BARS).astype(np.float64),
+        }, index=index)
+        for i in range(n_symbols)
+    }
+
+if __name__ == "__main__":
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    n_combos = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    frames = synthetic_frames(n_symbols)
+    params = random_params(SPACE, n_combos, seed=0)
+    cpus = os.cpu_count() or 1
+
+    print(f"{n_combos} combinations x {n_symbols} symbols x {N_BARS} bars ({cpus} CPUs)")
+    baseline = None
+    workers = 1
+    while workers <= cpus:
+        start = time.perf_counter()
+        rows = sum(1 for _ in sweep(frames, params, commission=0.0005, max_workers=workers))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"  {workers:>3} workers: {elapsed:7.2f} s  {rows * n_symbols / elapsed:9.0f} backtests/s  "
+              f"speedup {baseline / elapsed:4.1f}x")
+        workers *= 2
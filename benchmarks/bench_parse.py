@@ -0,0 +1,54 @@
+# benchmarks/bench_parse.py
+"""Parse time of a TIME_SERIES_DAILY payload: legacy DataFrame chain vs single-pass parser"""
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.alphavantage_api import parse_daily_series
+
+def make_payload(n_bars, seed=0):
+    """Synthetic date -> bar mapping shaped like the Alpha Vantage response"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-12-31", periods=n_bars).strftime("%Y-%m-%d")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return {
+        date: {
+            "1. open": f"{c * 0.995:.4f}",
+            "2. high": f"{c * 1.01:.4f}",
+            "3. low": f"{c * 0.99:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(int(vol)),
+        }
+        for date, c, vol in zip(dates[::-1], close[::-1], rng.integers(1e5, 1e7, n_bars))
+    }
+
+def legacy_parse(series):
+    """The original dict-of-dicts -> DataFrame -> transpose -> rename -> astype chain"""
+    df = pd.DataFrame(series).T
+    df = df.rename(columns={
+        "1. open": "Open",
+        "2. high": "High",
+        "3. low": "Low",
+        "4. close": "Close",
+        "5. volume": "Volume"
+    }).astype(float)
+    df.index = pd.to_datetime(df.index)
+    df.sort_index(inplace=True)
+    return df
+
+def bench(fn, payload, repeat=5):
+    number = max(1, 20000 // len(payload))
+    return min(timeit.repeat(lambda: fn(payload), number=number, repeat=repeat)) / number
+
+if __name__ == "__main__":
+    for n_bars in (1000, 5000):
+        payload = make_payload(n_bars)
+        pd.testing.assert_frame_equal(legacy_parse(payload), parse_daily_series(payload), check_freq=False, check_index_type=False)
+        before = bench(legacy_parse, payload)
+        after = bench(parse_daily_series, payload)
+        print(f"{n_bars:>5} bars  legacy {before * 1e3:8.2f} ms  single-pass {after * 1e3:8.2f} ms  "
+              f"speedup {before / after:5.1f}x")
@@ -0,0 +1,55 @@
+# benchmarks/bench_rsi.py
+"""RSI on a 1M-bar series: legacy pandas implementation vs the numpy kernels"""
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.indicators import calculate_rsi
+
+N_BARS = 1_000_000
+
+def legacy_rsi(prices, period=14):
+    """The original delta.where / rolling().mean() implementation"""
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+def pandas_wilder_rsi(prices, period=14):
+    """Wilder RSI built from pandas ewm, seeded with the first simple average"""
+    delta = prices.diff()
+    gain, loss = delta.clip(lower=0), -delta.clip(upper=0)
+    seeded_gain = gain.copy()
+    seeded_loss = loss.copy()
+    seeded_gain.iloc[:period] = np.nan
+    seeded_loss.iloc[:period] = np.nan
+    seeded_gain.iloc[period] = gain.iloc[1:period + 1].mean()
+    seeded_loss.iloc[period] = loss.iloc[1:period + 1].mean()
+    avg_gain = seeded_gain.ewm(alpha=1 / period, adjust=False).mean()
+    avg_loss = seeded_loss.ewm(alpha=1 / period, adjust=False).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def best_of(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, N_BARS))))
+
+    np.testing.assert_allclose(calculate_rsi(prices), legacy_rsi(prices), rtol=1e-9)
+    np.testing.assert_allclose(calculate_rsi(prices, method="wilder"), pandas_wilder_rsi(prices), rtol=1e-9)
+
+    rows = [
+        ("legacy pandas (sma)", lambda: legacy_rsi(prices)),
+        ("kernel sma", lambda: calculate_rsi(prices)),
+        ("pandas ewm (wilder)", lambda: pandas_wilder_rsi(prices)),
+        ("kernel wilder", lambda: calculate_rsi(prices, method="wilder")),
+    ]
+    print(f"RSI(14) on {N_BARS:,} bars")
+    for label, fn in rows:
+        print(f"  {label:<22} {best_of(fn) * 1e3:8.1f} ms")
@@ -0,0 +1,95 @@
+# benchmarks/bench_signals.py
+"""
+Compare the bitmask signal engine in `models.model.generate_signals` with the
+previous pandas implementation (copied below) on one long random walk.
+
+Run from the project root:
+    python benchmarks/bench_signals.py [bars]
+"""
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.model import explain, generate_signals
+from services.indicators import add_indicators
+
+def legacy_generate_signals(df):
+    """generate_signals as it was before the bitmask engine"""
+    df = df.copy()
+    df["Signal"] = "HOLD"
+    df["SMA_20_prev"] = df["SMA_20"].shift(1)
+    df["SMA_50_prev"] = df["SMA_50"].shift(1)
+    df["RSI_prev"] = df["RSI"].shift(1)
+    df["Price_Change_5d"] = df["Close"].pct_change(5)
+    df["Volume_Avg"] = df["Volume"].rolling(20).mean()
+    df["Volume_Ratio"] = df["Volume"] / df["Volume_Avg"]
+    if "MACD" in df.columns:
+        df["MACD_prev"] = df["MACD"].shift(1)
+        df["MACD_signal_prev"] = df["Signal_Line"].shift(1)
+
+    buy_conditions = [
+        (df["SMA_20"] > df["SMA_50"]) & (df["SMA_20_prev"] <= df["SMA_50_prev"]),
+        (df["RSI"] < 35) & (df["RSI"] > df["RSI_prev"]),
+        (df["Close"] > df["SMA_20"]) & (df["Close"] > df["Close"].shift(1)),
+    ]
+    if "MACD" in df.columns:
+        buy_conditions.append((df["MACD"] > df["Signal_Line"]) & (df["MACD_prev"] <= df["MACD_signal_prev"]))
+    buy_conditions += [df["Volume_Ratio"] > 1.2, df["Price_Change_5d"] > 0.02]
+
+    sell_conditions = [
+        (df["SMA_20"] < df["SMA_50"]) & (df["SMA_20_prev"] >= df["SMA_50_prev"]),
+        (df["RSI"] > 65) & (df["RSI"] < df["RSI_prev"]),
+        (df["Close"] < df["SMA_20"]) & (df["Close"] < df["Close"].shift(1)),
+    ]
+    if "MACD" in df.columns:
+        sell_conditions.append((df["MACD"] < df["Signal_Line"]) & (df["MACD_prev"] >= df["MACD_signal_prev"]))
+    sell_conditions += [(df["Volume_Ratio"] > 1.2) & (df["Close"] < df["Close"].shift(1)),
+                        df["Price_Change_5d"] < -0.02]
+
+    buy_mask = sum(buy_conditions) >= 2
+    sell_mask = sum(sell_conditions) >= 2
+    df.loc[buy_mask, "Signal"] = "BUY"
+    df.loc[sell_mask & ~buy_mask, "Signal"] = "SELL"
+
+    temp_columns = ["SMA_20_prev", "SMA_50_prev", "RSI_prev", "Price_Change_5d", "Volume_Avg", "Volume_Ratio"]
+    if "MACD" in df.columns:
+        temp_columns.extend(["MACD_prev", "MACD_signal_prev"])
+    return df.drop(columns=[col for col in temp_columns if col in df.columns])
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    df = pd.DataFrame({
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, bars).astype(np.float64),
+    }, index=pd.date_range("1900-01-01", periods=bars, freq="D"))
+    df = add_indicators(df)
+
+    legacy_time, legacy = best_of(lambda: legacy_generate_signals(df))
+    new_time, new = best_of(lambda: generate_signals(df))
+
+    assert (legacy["Signal"].to_numpy() == new["Signal"].astype(str).to_numpy()).all()
+    print(f"{bars:,} bars")
+    print(f"legacy generate_signals : {legacy_time * 1000:8.1f} ms")
+    print(f"bitmask generate_signals: {new_time * 1000:8.1f} ms  ({legacy_time / new_time:.1f}x)")
+    print(f"signal column memory    : {legacy['Signal'].memory_usage(index=False, deep=True) / 1e6:.1f} MB -> "
+          f"{new['Signal'].memory_usage(index=False, deep=True) / 1e6:.1f} MB")
+    print("signal counts:", new["Signal"].value_counts().to_dict())
+    last = new[new["Signal"] != "HOLD"].iloc[-1]
+    print(f"last {last['Signal']} fired on:", ", ".join(explain(last["Signal_Mask"])))
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,39 @@ ALPHAVANTAGE_API_KEY = os.getenv("ALPHAVANTAGE_API_KEY", "U9VMZ8EJV6H0NDP6")
 # Default stock symbol
 DEFAULT_SYMBOL = "AAPL"
 
-# API settings
-API_BASE_URL = "https://www.alphavantage.co/query"
+# API settings (point the base URL at services/mock_alphavantage.py to run offline)
+API_BASE_URL = os.getenv("ALPHAVANTAGE_BASE_URL", "https://www.alphavantage.co/query")
 REQUEST_TIMEOUT = 30  # seconds
+
+# Local OHLCV cache (memory-mapped column directories keyed by symbol and outputsize)
+CACHE_DIR = os.getenv("STOCK_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache"))
+
+# Alpha Vantage request budget (free tier defaults)
+API_CALLS_PER_MINUTE = int(os.getenv("ALPHAVANTAGE_CALLS_PER_MINUTE", "5"))
+API_CALLS_PER_DAY = int(os.getenv("ALPHAVANTAGE_CALLS_PER_DAY", "25"))
+
+# Max entries per cached dashboard pipeline stage (LRU bound shared by all sessions)
+PIPELINE_CACHE_ENTRIES = int(os.getenv("PIPELINE_CACHE_ENTRIES", "64"))
+
+# Symbols pre-filled in the screener page (comma separated)
+DEFAULT_WATCHLIST = os.getenv("STOCK_WATCHLIST", "AAPL,MSFT,GOOGL,AMZN,NVDA,META,TSLA,JPM,V,UNH")
+
+# Precomputed indicators/signals written by jobs/nightly_signals.py (partitioned Parquet)
+SIGNALS_DIR = os.getenv("STOCK_SIGNALS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "signals"))
+
+# Chart rendering: longer series are aggregated/downsampled to about this many
+# points (roughly the chart's pixel width); traces above the threshold use WebGL
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "1500"))
+CHART_WEBGL_THRESHOLD = int(os.getenv("CHART_WEBGL_THRESHOLD", "1000"))
+
+# Live intraday feed: bars kept per symbol/interval (ring buffer) and the
+# minimum seconds between API polls shared by every session watching it
+INTRADAY_BUFFER_BARS = int(os.getenv("INTRADAY_BUFFER_BARS", "2000"))
+INTRADAY_POLL_SECONDS = int(os.getenv("INTRADAY_POLL_SECONDS", "60"))
+
+# Memory budget of the process-wide store of prices/indicators shared by all sessions
+SHARED_STORE_MB = int(os.getenv("SHARED_STORE_MB", "512"))
+
+# Worker processes for signals, backtests and screens (0 computes inline in
+# the server process); scale independently of the number of UI servers
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", "2"))
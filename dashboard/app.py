@@ -1,19 +1,26 @@
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
-import numpy as np
 import sys
 import os
 from datetime import datetime, timedelta
-import time
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.alphavantage_api import fetch_daily_data
-from services.indicators import add_indicators
-from models.model import generate_signals
-from config import DEFAULT_SYMBOL
+from dashboard.charts import indicator_figure, intraday_figure, line_trace, price_figure, volume_figure
+from services.alphavantage_api import INTRADAY_INTERVALS, OHLCV_COLUMNS, cached_daily_data, fetch_daily_data
+from services.background import BackgroundRefresher
+from services.compute import get_compute_service
+from services.indicators import add_indicators, indicator_columns
+from services.intraday import IntradayFeed
+from services.shared_store import get_shared_store
+from services.signal_store import read_history
+from models.backtest import POSITION_MODES, run_backtest
+from models.metrics import RECENT_BARS, market_metrics
+from models.model import CONDITIONS, SIGNAL_INDICATORS, SignalInputs, Strategy, explain, generate_signals
+from config import DEFAULT_SYMBOL, INTRADAY_POLL_SECONDS, PIPELINE_CACHE_ENTRIES
 
 # --------------------------
 # Streamlit Page Config
@@ -25,6 +32,122 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --------------------------
+# Cached Data Pipeline
+# --------------------------
+# Each stage is keyed on cheap scalars only. `data_version` is the fetch
+# timestamp of the stored series, so entries roll over as soon as a refresh
+# lands after market close; older versions fall out of the store's LRU
+# instead of piling up per user. Stages only read the local store - network
+# fetches happen in the background refresher.
+#
+# Stage results live in the process-wide shared store: every session asking
+# for the same key gets the same read-only object, and concurrent requests
+# wait for the one computation in flight instead of repeating it.
+@st.cache_resource
+def get_refresher():
+    return BackgroundRefresher()
+
+def load_prices(symbol, outputsize, data_version):
+    return get_shared_store().get_or_compute(("prices", symbol, outputsize, data_version),
+                                             lambda: cached_daily_data(symbol, outputsize)[0])
+
+def _compute_indicators(symbol, outputsize, data_version, rsi_method, columns):
+    # With compute workers configured this stage runs in a worker process and
+    # only its Arrow result is kept
+    service = get_compute_service()
+    if service is not None:
+        return service.indicators(symbol, outputsize, data_version, rsi_method, columns).result()
+    # Reuse the nightly job's output when it was built from this exact data version
+    precomputed, _ = read_history(symbol, outputsize, columns=[*OHLCV_COLUMNS, *columns],
+                                  fetched_at=data_version, rsi_method=rsi_method)
+    if precomputed is not None:
+        return precomputed
+    # add_indicators works in place and the stored prices are shared
+    return add_indicators(load_prices(symbol, outputsize, data_version).copy(), rsi_method=rsi_method, columns=columns)
+
+def load_indicators(symbol, outputsize, data_version, rsi_method="sma", columns=SIGNAL_INDICATORS):
+    return get_shared_store().get_or_compute(("indicators", symbol, outputsize, data_version, rsi_method, columns),
+                                             _compute_indicators, symbol, outputsize, data_version, rsi_method, columns)
+
+# Strategy changes re-evaluate the rules against these arrays without
+# copying or recomputing indicators
+def load_signal_inputs(symbol, outputsize, data_version, rsi_method="sma", columns=SIGNAL_INDICATORS):
+    def build():
+        df = load_indicators(symbol, outputsize, data_version, rsi_method, columns)
+        return df, SignalInputs(df)
+    return get_shared_store().get_or_compute(("signal_inputs", symbol, outputsize, data_version, rsi_method, columns),
+                                             build)
+
+def load_signals(symbol, outputsize, data_version, rsi_method, columns, strategy):
+    df, inputs = load_signal_inputs(symbol, outputsize, data_version, rsi_method, columns)
+    return get_shared_store().get_or_compute(("signals", symbol, outputsize, data_version, rsi_method, columns, strategy),
+                                             generate_signals, df, strategy, inputs)
+
+def _run_backtest(df, mode, commission, slippage):
+    service = get_compute_service()
+    if service is None:
+        return run_backtest(df, mode, commission=commission, slippage=slippage)
+    return service.backtest(df, mode, commission, slippage).result()
+
+# `df` is the signal frame's displayed window: the data version, RSI method,
+# strategy and its first and last bar identify it
+def backtest_window(df, symbol, outputsize, data_version, rsi_method, strategy, mode, commission, slippage):
+    key = ("backtest", symbol, outputsize, data_version, rsi_method, strategy, (df.index[0], df.index[-1]),
+           mode, commission, slippage)
+    return get_shared_store().get_or_compute(key, _run_backtest, df, mode, commission, slippage)
+
+def fetch_coalesced(symbol, outputsize):
+    """Network fetch that concurrent sessions share instead of repeating"""
+    return get_shared_store().coalesce(("fetch", symbol, outputsize), fetch_daily_data, symbol, outputsize)
+
+# `_df` is not hashed: the data version, RSI method, strategy and bar window
+# identify it, and `view` holds the indicator toggles
+@st.cache_data(ttl=24 * 3600, max_entries=PIPELINE_CACHE_ENTRIES, show_spinner=False)
+def load_figures(_df, symbol, data_version, rsi_method, strategy, window, view):
+    show_sma, show_ema, show_bollinger, show_rsi, show_macd = view
+    figures = {
+        "price": price_figure(_df, symbol, show_sma, show_ema, show_bollinger),
+        "volume": volume_figure(_df, symbol),
+        "indicators": indicator_figure(_df, symbol, show_rsi, show_macd, strategy.rsi_oversold, strategy.rsi_overbought),
+    }
+    return {name: fig.to_json() for name, fig in figures.items()}
+
+# One feed per symbol/interval shared by all sessions; each holds a bounded ring buffer
+@st.cache_resource(max_entries=PIPELINE_CACHE_ENTRIES, show_spinner=False)
+def get_intraday_feed(symbol, interval, rsi_method="sma"):
+    return IntradayFeed(symbol, interval, rsi_method=rsi_method)
+
+@st.fragment(run_every=INTRADAY_POLL_SECONDS)
+def live_intraday(symbol, interval, rsi_method="sma"):
+    """Poll for bars after the last buffered one and redraw only this chart"""
+    feed = get_intraday_feed(symbol, interval, rsi_method)
+    try:
+        added = feed.poll()
+    except Exception as e:
+        added = 0
+        st.warning(f"⚠️ Intraday update failed: {e}")
+    bars = feed.frame()
+    if bars.empty:
+        st.info("No intraday bars available yet.")
+        return
+    # A stable key lets the frontend update the existing chart instead of remounting it
+    st.plotly_chart(intraday_figure(bars, symbol, interval), width='stretch', key=f"intraday-{symbol}-{interval}")
+    st.caption(f"{len(bars)} bars buffered (max {feed.buffer.capacity}) · last bar {bars.index[-1]} · "
+               f"{added} new this poll")
+
+@st.fragment(run_every=2)
+def watch_refresh(refresh_key, as_of):
+    """Show the stale marker until the background refresh lands, then rerun with new data"""
+    refresher = get_refresher()
+    error = refresher.last_error(refresh_key)
+    if refresher.is_running(refresh_key):
+        st.info(f"⏳ Showing data as of {as_of} - refreshing market data in the background...")
+    elif error is not None:
+        st.warning(f"⚠️ Showing data as of {as_of} - refresh failed: {error}")
+    else:
+        st.rerun()
+
 # --------------------------
 # Premium Enterprise Styling
 # --------------------------
@@ -366,9 +489,10 @@ st.sidebar.markdown('<div class="sidebar-header"><div class="sidebar-title"><i c
 st.sidebar.markdown("### <i class='fas fa-search'></i> Market Analysis", unsafe_allow_html=True)
 symbol = st.sidebar.text_input("🎯 Stock Symbol", value=DEFAULT_SYMBOL, help="Enter any valid stock ticker (e.g., AAPL, TSLA, GOOGL)")
 
+TIMEFRAME_DAYS = {"1M": 30, "3M": 90, "6M": 180, "1Y": 365, "2Y": 730, "5Y": 1825, "10Y": 3650, "Max": None}
 time_period = st.sidebar.selectbox(
     "⏰ Analysis Timeframe", 
-    ["1M", "3M", "6M", "1Y", "2Y", "5Y"], 
+    list(TIMEFRAME_DAYS), 
     index=2,
     help="Select the time period for historical analysis"
 )
@@ -378,10 +502,31 @@ show_sma = st.sidebar.checkbox(" Simple Moving Average (SMA)", value=True)
 show_ema = st.sidebar.checkbox(" Exponential Moving Average (EMA)", value=True)
 show_rsi = st.sidebar.checkbox(" Relative Strength Index (RSI)", value=True)
 show_macd = st.sidebar.checkbox(" MACD Convergence Divergence", value=True)
+show_bollinger = st.sidebar.checkbox(" Bollinger Bands", value=False)
+RSI_SMOOTHING = {"Simple (Cutler)": "sma", "Wilder": "wilder"}
+rsi_smoothing = st.sidebar.selectbox("📐 RSI Smoothing", list(RSI_SMOOTHING), index=0,
+                                     help="Wilder's smoothing matches the RSI quoted by most trading platforms")
 
 st.sidebar.markdown("### <i class='fas fa-shield-alt'></i> Risk Parameters", unsafe_allow_html=True)
-rsi_oversold = st.sidebar.slider("🔻 RSI Oversold Level", 20, 40, 30, help="RSI below this level indicates oversold condition")
-rsi_overbought = st.sidebar.slider("🔺 RSI Overbought Level", 60, 80, 70, help="RSI above this level indicates overbought condition")
+rsi_oversold = st.sidebar.slider("🔻 RSI Oversold Level", 20, 40, 35, help="RSI below this level (and rising) counts as a buy condition")
+rsi_overbought = st.sidebar.slider("🔺 RSI Overbought Level", 60, 80, 65, help="RSI above this level (and falling) counts as a sell condition")
+with st.sidebar.expander("⚙️ Signal Rules"):
+    min_votes = st.slider("Conditions required", 1, 4, 2, help="How many buy (or sell) conditions must agree")
+    volume_ratio = st.slider("Volume confirmation (x 20-day average)", 1.0, 2.0, 1.2, step=0.05)
+    momentum_pct = st.slider("5-day momentum threshold (%)", 0.5, 5.0, 2.0, step=0.5)
+    enabled_conditions = st.multiselect("Enabled conditions", CONDITIONS, default=CONDITIONS,
+                                        format_func=lambda name: name.replace("_", " ").title())
+with st.sidebar.expander("🧪 Backtest Settings"):
+    position_mode = st.selectbox("Position mode", POSITION_MODES, format_func=lambda mode: mode.replace("_", " ").title(),
+                                 help="Long only: SELL closes the position. Long/short: SELL reverses into a short")
+    commission_bps = st.number_input("Commission (bps per trade)", 0.0, 100.0, 5.0, step=1.0)
+    slippage_bps = st.number_input("Slippage (bps per trade)", 0.0, 100.0, 5.0, step=1.0)
+with st.sidebar.expander("📡 Live Intraday"):
+    show_intraday = st.checkbox("Stream intraday bars", value=False,
+                                help=f"Polls for new bars every {INTRADAY_POLL_SECONDS}s and updates only the intraday chart")
+    intraday_interval = st.selectbox("Bar interval", INTRADAY_INTERVALS, index=1)
+strategy = Strategy(rsi_oversold=rsi_oversold, rsi_overbought=rsi_overbought, volume_ratio=volume_ratio,
+                    momentum=momentum_pct / 100, min_votes=min_votes, conditions=tuple(enabled_conditions))
 
 st.sidebar.markdown("---")
 if st.sidebar.button(" Refresh Market Data", type="primary"):
@@ -391,37 +536,52 @@ if st.sidebar.button(" Refresh Market Data", type="primary"):
 st.sidebar.markdown("### <i class='fas fa-globe'></i> Market Status", unsafe_allow_html=True)
 st.sidebar.success("🟢 Markets Open")
 st.sidebar.info(f"🕐 Last Updated: {datetime.now().strftime('%H:%M:%S')}")
+store_status = st.sidebar.empty()
+compute_status = st.sidebar.empty()
 
 # --------------------------
 # Main Dashboard
 # --------------------------
 try:
-    with st.spinner("🔄 Fetching real-time market data..."):
-        time.sleep(0.5)
-
-    # Fetch & Process Data
-    df_raw = fetch_daily_data(symbol)
-    df_raw = add_indicators(df_raw)
-    df_raw = generate_signals(df_raw)
-
-    # Filter data based on selected time period
-    today = datetime.now()
-    if time_period == "1M":
-        start_date = today - timedelta(days=30)
-    elif time_period == "3M":
-        start_date = today - timedelta(days=90)
-    elif time_period == "6M":
-        start_date = today - timedelta(days=180)
-    elif time_period == "1Y":
-        start_date = today - timedelta(days=365)
-    elif time_period == "2Y":
-        start_date = today - timedelta(days=730)
-    elif time_period == "5Y":
-        start_date = today - timedelta(days=1825)
+    # Fetch & Process Data (longer timeframes need the full history)
+    lookback_days = TIMEFRAME_DAYS.get(time_period, 180)
+    outputsize = "compact" if lookback_days is not None and lookback_days <= 90 else "full"
+    refresh_key = (symbol.upper(), outputsize)
+    # Created up front so worker processes start while stored data is read
+    compute_service = get_compute_service()
+
+    # Render whatever is stored right away; only a never-seen symbol blocks on the network
+    stored_df, stored_meta, is_fresh = cached_daily_data(*refresh_key)
+    if stored_df is None:
+        with st.spinner("🔄 Fetching real-time market data..."):
+            fetch_coalesced(*refresh_key)
+        stored_df, stored_meta, is_fresh = cached_daily_data(*refresh_key)
+    elif not is_fresh:
+        get_refresher().submit(refresh_key, fetch_coalesced, *refresh_key)
+        watch_refresh(refresh_key, stored_df.index[-1].strftime('%Y-%m-%d'))
+
+    # Compute only what is displayed plus what the signal rules read
+    visible_groups = [group for group, shown in (("sma", show_sma), ("ema", show_ema), ("rsi", show_rsi),
+                                                 ("macd", show_macd), ("bollinger", show_bollinger)) if shown]
+    indicator_set = tuple(sorted(set(SIGNAL_INDICATORS) | set(indicator_columns(*visible_groups))))
+    df_raw = load_signals(*refresh_key, stored_meta.get("fetched_at", ""), RSI_SMOOTHING[rsi_smoothing],
+                          indicator_set, strategy)
+    store_stats = get_shared_store().stats()
+    store_status.caption(f"♻️ Shared data store: {store_stats['saved']} calls saved · {store_stats['entries']} entries · "
+                         f"{store_stats['bytes'] / 2**20:.0f}/{store_stats['max_bytes'] / 2**20:.0f} MB")
+    if compute_service is not None:
+        compute_stats = compute_service.stats()
+        indicator_timing = compute_stats["by_kind"].get("indicators")
+        compute_status.caption(f"⚙️ {compute_stats['workers']} compute workers · {compute_stats['in_flight']} running · "
+                               f"{compute_stats['queue_depth']} queued"
+                               + (f" · indicators job {indicator_timing['last_run_ms']:.0f} ms" if indicator_timing else ""))
+
+    # Filter data based on selected time period (binary search on the sorted index)
+    if lookback_days is None:
+        df = df_raw
     else:
-        start_date = today - timedelta(days=180)  # Default to 6M
-    
-    df = df_raw.loc[df_raw.index >= start_date]
+        start_date = datetime.now() - timedelta(days=lookback_days)
+        df = df_raw.iloc[df_raw.index.searchsorted(start_date):]
 
     if df.empty:
         st.error("No data available for the selected time period.")
@@ -432,25 +592,13 @@ try:
     # ----------------------
     st.markdown('<div class="section-header"><i class="fas fa-chart-area"></i> Live Market Intelligence</div>', unsafe_allow_html=True)
 
-    # Calculate advanced metrics
-    current_price = df['Close'].iloc[-1]
-    prev_price = df['Close'].iloc[-2]
-    price_change = current_price - prev_price
-    price_change_pct = (price_change / prev_price) * 100
-    
-    # Advanced volume analysis
-    avg_volume = df['Volume'].rolling(20).mean().iloc[-1]
-    current_volume = df['Volume'].iloc[-1]
-    volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
-    
-    # Risk metrics
-    returns = df['Close'].pct_change().dropna()
-    volatility = returns.std() * np.sqrt(252) * 100
-    sharpe_ratio = (returns.mean() * 252) / (returns.std() * np.sqrt(252)) if returns.std() > 0 else 0
-    max_drawdown = ((df['Close'] / df['Close'].expanding().max()) - 1).min() * 100
-    
-    # Performance metrics
-    ytd_return = ((current_price - df['Close'].iloc[0]) / df['Close'].iloc[0]) * 100
+    # Every card and table value in one pass over the window's arrays
+    metrics = market_metrics(df)
+    current_price = metrics.price
+    price_change, price_change_pct = metrics.price_change, metrics.price_change_pct
+    volume_ratio = metrics.volume_ratio
+    volatility, sharpe_ratio, max_drawdown = metrics.volatility, metrics.sharpe, metrics.max_drawdown
+    ytd_return = metrics.period_return
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -565,100 +713,28 @@ try:
     # ----------------------
     st.markdown('<div class="section-header"><i class="fas fa-chart-line"></i> Advanced Price Analysis</div>', unsafe_allow_html=True)
     
+    # Figures are cached as JSON per view, so revisiting one skips rebuilding it
+    figures = load_figures(df, symbol.upper(), stored_meta.get("fetched_at", ""), RSI_SMOOTHING[rsi_smoothing], strategy,
+                           (df.index[0], df.index[-1]), (show_sma, show_ema, show_bollinger, show_rsi, show_macd))
+
     # 1. Candlestick Chart with Signals
-    fig_price = go.Figure()
-    fig_price.add_trace(go.Candlestick(
-        x=df.index,
-        open=df["Open"], high=df["High"], low=df["Low"], close=df["Close"],
-        name="Price",
-        increasing_line_color='#26a69a', decreasing_line_color='#ef5350'
-    ))
-    
-    if show_sma and "SMA_20" in df.columns:
-        fig_price.add_trace(go.Scatter(x=df.index, y=df["SMA_20"], line=dict(color="#3498db", width=2), name="SMA 20"))
-    if show_sma and "SMA_50" in df.columns:
-        fig_price.add_trace(go.Scatter(x=df.index, y=df["SMA_50"], line=dict(color="#e74c3c", width=2), name="SMA 50"))
-    if show_ema and "EMA_20" in df.columns:
-        fig_price.add_trace(go.Scatter(x=df.index, y=df["EMA_20"], line=dict(color="#9b59b6", width=2, dash='dash'), name="EMA 20"))
-
-    buy_signals = df[df["Signal"] == "BUY"]
-    if not buy_signals.empty:
-        fig_price.add_trace(go.Scatter(
-            x=buy_signals.index,
-            y=buy_signals['Low'] * 0.98,
-            mode='markers',
-            marker=dict(symbol='triangle-up', size=12, color='#2ecc71', line=dict(width=1, color='white')),
-            name='Buy Signal'
-        ))
-
-    sell_signals = df[df["Signal"] == "SELL"]
-    if not sell_signals.empty:
-        fig_price.add_trace(go.Scatter(
-            x=sell_signals.index,
-            y=sell_signals['High'] * 1.02,
-            mode='markers',
-            marker=dict(symbol='triangle-down', size=12, color='#e74c3c', line=dict(width=1, color='white')),
-            name='Sell Signal'
-        ))
-
-    fig_price.update_layout(
-        title=dict(text=f"<b>Price & Moving Averages for {symbol}</b>", x=0.5, font=dict(color='#f0f2f6')),
-        xaxis_rangeslider_visible=False,
-        height=600,
-        template="plotly_dark",
-        margin=dict(l=20, r=20, t=60, b=20),
-        plot_bgcolor="#2c3e50",
-        paper_bgcolor="#1e1e2f"
-    )
-
-    st.plotly_chart(fig_price, width='stretch')
+    st.plotly_chart(pio.from_json(figures["price"]), width='stretch')
+
+    if show_intraday:
+        st.markdown('<div class="section-header"><i class="fas fa-satellite-dish"></i> Live Intraday</div>', unsafe_allow_html=True)
+        live_intraday(symbol.upper(), intraday_interval, RSI_SMOOTHING[rsi_smoothing])
 
     # ----------------------
     # Premium Volume Analysis
     # ----------------------
     st.markdown('<div class="section-header"><i class="fas fa-chart-bar"></i> Volume Intelligence</div>', unsafe_allow_html=True)
-    fig_volume = go.Figure()
-    fig_volume.add_trace(go.Bar(x=df.index, y=df['Volume'], name='Volume', marker_color='#3498db'))
-    fig_volume.update_layout(
-        title=dict(text=f"<b>Daily Volume for {symbol}</b>", x=0.5, font=dict(color='#f0f2f6')),
-        xaxis_rangeslider_visible=False,
-        height=250,
-        template="plotly_dark",
-        margin=dict(l=20, r=20, t=60, b=20),
-        plot_bgcolor="#2c3e50",
-        paper_bgcolor="#1e1e2f"
-    )
-    st.plotly_chart(fig_volume, width='stretch')
+    st.plotly_chart(pio.from_json(figures["volume"]), width='stretch')
 
     # ----------------------
     # Advanced Technical Analysis
     # ----------------------
     st.markdown('<div class="section-header"><i class="fas fa-brain"></i> AI-Powered Technical Indicators</div>', unsafe_allow_html=True)
-    fig_indicators = go.Figure()
-    
-    if show_rsi and "RSI" in df.columns:
-        fig_indicators.add_trace(go.Scatter(x=df.index, y=df['RSI'], name='RSI', line=dict(color='#9b59b6')))
-        fig_indicators.add_hline(y=rsi_overbought, line_dash="dash", line_color="#e74c3c", annotation_text="Overbought")
-        fig_indicators.add_hline(y=rsi_oversold, line_dash="dash", line_color="#2ecc71", annotation_text="Oversold")
-    
-    if show_macd and "MACD" in df.columns:
-        fig_indicators.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='#3498db')))
-        fig_indicators.add_trace(go.Scatter(x=df.index, y=df['Signal_Line'], name='Signal Line', line=dict(color='#e74c3c', dash='dot')))
-        fig_indicators.add_trace(go.Bar(
-            x=df.index, y=df['MACD_Histogram'], name='MACD Hist',
-            marker_color=['#2ecc71' if hist > 0 else '#e74c3c' for hist in df['MACD_Histogram']]
-        ))
-        
-    fig_indicators.update_layout(
-        title=dict(text=f"<b>RSI & MACD for {symbol}</b>", x=0.5, font=dict(color='#f0f2f6')),
-        xaxis_rangeslider_visible=False,
-        height=350,
-        template="plotly_dark",
-        margin=dict(l=20, r=20, t=60, b=20),
-        plot_bgcolor="#2c3e50",
-        paper_bgcolor="#1e1e2f"
-    )
-    st.plotly_chart(fig_indicators, width='stretch')
+    st.plotly_chart(pio.from_json(figures["indicators"]), width='stretch')
 
     # ----------------------
     # AI Trading Intelligence
@@ -667,19 +743,20 @@ try:
     
     if "Signal" in df.columns and not df.empty:
         last_signal = df["Signal"].iloc[-1]
-        rsi_current = df['RSI'].iloc[-1]
+        rsi_current = metrics.rsi
         signal_strength = "STRONG" if abs(rsi_current - 50) > 25 else "MODERATE" if abs(rsi_current - 50) > 15 else "WEAK"
         
         # Calculate signal confidence score
         confidence_factors = []
         if abs(rsi_current - 50) > 20: confidence_factors.append("RSI Extreme")
-        if df['Volume'].iloc[-1] > df['Volume'].rolling(20).mean().iloc[-1] * 1.5: confidence_factors.append("High Volume")
-        if abs(df['Close'].iloc[-1] - df['SMA_20'].iloc[-1]) > df['Close'].iloc[-1] * 0.02: confidence_factors.append("Price Divergence")
+        if metrics.volume_ratio > 1.5: confidence_factors.append("High Volume")
+        if abs(metrics.price - metrics.sma_20) > metrics.price * 0.02: confidence_factors.append("Price Divergence")
         
         confidence_score = len(confidence_factors) * 33.33
         confidence_level = "HIGH" if confidence_score > 66 else "MEDIUM" if confidence_score > 33 else "LOW"
         
-        signal_counts = df["Signal"].value_counts()
+        signal_counts = metrics.signal_counts
+        triggered_rules = explain(df["Signal_Mask"].iloc[-1], strategy)
         
         # Premium signal metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -734,6 +811,7 @@ try:
                     <div class="signal-title"><i class="fas fa-arrow-trend-up"></i> STRONG BUY SIGNAL</div>
                     <div class="signal-subtitle">Confidence: {confidence_level} | Strength: {signal_strength} | RSI: {rsi_current:.1f}</div>
                     <div style="margin-top: 1rem; font-size: 0.9rem; opacity: 0.8;">Factors: {', '.join(confidence_factors) if confidence_factors else 'Standard Analysis'}</div>
+                    <div style="margin-top: 0.5rem; font-size: 0.9rem; opacity: 0.8;">Rules: {', '.join(triggered_rules)}</div>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -744,6 +822,7 @@ try:
                     <div class="signal-title"><i class="fas fa-arrow-trend-down"></i> STRONG SELL SIGNAL</div>
                     <div class="signal-subtitle">Confidence: {confidence_level} | Strength: {signal_strength} | RSI: {rsi_current:.1f}</div>
                     <div style="margin-top: 1rem; font-size: 0.9rem; opacity: 0.8;">Factors: {', '.join(confidence_factors) if confidence_factors else 'Standard Analysis'}</div>
+                    <div style="margin-top: 0.5rem; font-size: 0.9rem; opacity: 0.8;">Rules: {', '.join(triggered_rules)}</div>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -758,6 +837,9 @@ try:
             </div>
             """, unsafe_allow_html=True)
 
+        backtest = backtest_window(df, *refresh_key, stored_meta.get("fetched_at", ""), RSI_SMOOTHING[rsi_smoothing],
+                                   strategy, position_mode, commission_bps / 1e4, slippage_bps / 1e4)
+
         # Premium Signal History
         recent_signals = df[df["Signal"] != "HOLD"].tail(10)
         if not recent_signals.empty:
@@ -765,9 +847,11 @@ try:
             sig_display = recent_signals[["Close", "RSI", "SMA_20", "SMA_50", "Signal"]].copy()
             sig_display.index = sig_display.index.strftime('%Y-%m-%d')
             
-            # Add performance column
-            sig_display['Performance'] = sig_display['Close'].pct_change().fillna(0) * 100
+            # Return of the backtest trade each signal opened (blank if it didn't open one)
+            trade_returns = backtest.trades.set_index("Entry")["Return"]
+            sig_display['Trade Return %'] = trade_returns.reindex(recent_signals.index).to_numpy() * 100
             sig_display = sig_display.round(2)
+            sig_display['Rules'] = [', '.join(explain(mask, strategy)) for mask in recent_signals["Signal_Mask"]]
             
             st.dataframe(
                 sig_display, 
@@ -777,6 +861,41 @@ try:
             )
         else:
             st.info("🚧 No recent BUY/SELL signals detected. Market in consolidation phase - Monitoring for opportunities.")
+
+        # Strategy Backtest
+        st.markdown("#### <i class='fas fa-flask'></i> Strategy Backtest", unsafe_allow_html=True)
+        stats = backtest.stats
+        bt_cols = st.columns(4)
+        bt_cards = [
+            ("💰", f"{stats['total_return']:.1%}", "Total Return", f"CAGR {stats['cagr']:.1%}"),
+            ("📐", f"{stats['sharpe']:.2f}", "Sharpe Ratio", "Annualised"),
+            ("📉", f"{stats['max_drawdown']:.1%}", "Max Drawdown", "Peak to trough"),
+            ("🎯", f"{stats['hit_rate']:.0%}", "Hit Rate", f"{stats['trades']} trades"),
+        ]
+        for col, (icon, value, label, note) in zip(bt_cols, bt_cards):
+            with col:
+                st.markdown(f"""
+                <div class="premium-metric-card">
+                    <div class="metric-icon">{icon}</div>
+                    <div class="metric-value">{value}</div>
+                    <div class="metric-label">{label}</div>
+                    <div class="metric-change">{note}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+        fig_equity = go.Figure()
+        fig_equity.add_trace(line_trace(backtest.equity, name='Strategy', line=dict(color='#2ecc71')))
+        fig_equity.add_trace(line_trace(backtest.equity.iloc[0] * df['Close'] / df['Close'].iloc[0],
+                                        name='Buy & Hold', line=dict(color='#95a5a6', dash='dot')))
+        fig_equity.update_layout(
+            title=dict(text=f"<b>Equity Curve ({position_mode.replace('_', ' ')})</b>", x=0.5, font=dict(color='#f0f2f6')),
+            height=350,
+            template="plotly_dark",
+            margin=dict(l=20, r=20, t=60, b=20),
+            plot_bgcolor="#2c3e50",
+            paper_bgcolor="#1e1e2f"
+        )
+        st.plotly_chart(fig_equity, width='stretch')
     else:
         st.warning("Signal generation failed or no data available.")
 
@@ -786,12 +905,12 @@ try:
     st.markdown('<div class="section-header"><i class="fas fa-database"></i> Comprehensive Market Data Intelligence</div>', unsafe_allow_html=True)
     
     # Create enhanced data display with additional calculated fields
-    display_df = df[["Open", "High", "Low", "Close", "Volume", "SMA_20", "SMA_50", "RSI", "Signal"]].tail(20).copy()
+    display_df = df[["Open", "High", "Low", "Close", "Volume", "SMA_20", "SMA_50", "RSI", "Signal"]].tail(RECENT_BARS).copy()
     
     # Add calculated fields
-    display_df['Daily Change %'] = df['Close'].pct_change() * 100
-    display_df['Volume Ratio'] = df['Volume'] / df['Volume'].rolling(20).mean()
-    display_df['Price vs SMA20'] = ((df['Close'] - df['SMA_20']) / df['SMA_20'] * 100)
+    display_df['Daily Change %'] = metrics.change_pct
+    display_df['Volume Ratio'] = metrics.volume_ratios
+    display_df['Price vs SMA20'] = metrics.vs_sma20
     
     # Round for display
     display_df = display_df.round(2)
@@ -805,11 +924,11 @@ try:
         stats_data = {
             'Metric': ['Average Price', 'Highest Price', 'Lowest Price', 'Total Volume', 'Avg Daily Volume'],
             'Value': [
-                f"${df['Close'].tail(20).mean():.2f}",
-                f"${df['High'].tail(20).max():.2f}",
-                f"${df['Low'].tail(20).min():.2f}",
-                f"{df['Volume'].tail(20).sum():,.0f}",
-                f"{df['Volume'].tail(20).mean():,.0f}"
+                f"${metrics.recent_avg_close:.2f}",
+                f"${metrics.recent_high:.2f}",
+                f"${metrics.recent_low:.2f}",
+                f"{metrics.recent_volume:,.0f}",
+                f"{metrics.recent_avg_volume:,.0f}"
             ]
         }
         st.dataframe(pd.DataFrame(stats_data), hide_index=True, width='stretch')
@@ -819,11 +938,11 @@ try:
         tech_data = {
             'Indicator': ['Current RSI', 'RSI Average', 'Bullish Days', 'Bearish Days', 'Neutral Days'],
             'Value': [
-                f"{df['RSI'].iloc[-1]:.1f}",
-                f"{df['RSI'].tail(20).mean():.1f}",
-                f"{len(df[df['Signal'] == 'BUY'].tail(20))}",
-                f"{len(df[df['Signal'] == 'SELL'].tail(20))}",
-                f"{len(df[df['Signal'] == 'HOLD'].tail(20))}"
+                f"{metrics.rsi:.1f}",
+                f"{metrics.recent_avg_rsi:.1f}",
+                f"{metrics.recent_signal_counts['BUY']}",
+                f"{metrics.recent_signal_counts['SELL']}",
+                f"{metrics.recent_signal_counts['HOLD']}"
             ]
         }
         st.dataframe(pd.DataFrame(tech_data), hide_index=True, width='stretch')
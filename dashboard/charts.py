@@ -0,0 +1,197 @@
+# dashboard/charts.py
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from config import CHART_MAX_POINTS, CHART_WEBGL_THRESHOLD
+from models.backtest import signal_codes
+from models.strategy import BUY, SELL
+
+# Candle periods tried in order when a history has more bars than the chart has points
+OHLC_PERIODS = (("W-FRI", "Weekly"), ("M", "Monthly"), ("Q", "Quarterly"), ("Y", "Yearly"))
+
+def _period_starts(index, period):
+    """Positions of the first bar of every calendar `period` in a sorted DatetimeIndex"""
+    keys = index.to_period(period).asi8
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+def aggregate_ohlc(df, max_bars=CHART_MAX_POINTS):
+    """
+    OHLCV bars coarse enough to fit `max_bars`: the source bars when they fit,
+    else the first of weekly, monthly, ... candles that does. Each candle is
+    dated at its last source bar. Returns (frame, period label).
+    """
+    if len(df) <= max_bars:
+        return df, "Daily"
+    if isinstance(df.index, pd.DatetimeIndex):
+        for period, label in OHLC_PERIODS:
+            starts = _period_starts(df.index, period)
+            if len(starts) <= max_bars:
+                break
+    else:
+        step = -(-len(df) // max_bars)
+        starts = np.arange(0, len(df), step)
+        label = f"{step}-Bar"
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    bars = {
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(), starts),
+        "Close": df["Close"].to_numpy()[ends],
+    }
+    if "Volume" in df.columns:
+        bars["Volume"] = np.add.reduceat(df["Volume"].to_numpy(), starts)
+    return pd.DataFrame(bars, index=df.index[ends]), label
+
+def lttb_indices(x, y, n_out):
+    """
+    Positions of the `n_out` points Largest-Triangle-Three-Buckets keeps from
+    the line (x, y): the end points plus, per bucket, the point forming the
+    largest triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes, y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i + 1] - y[a]))
+        a = keep[i + 1] = lo + int(np.argmax(area))
+    return keep
+
+def downsample_series(series, max_points=CHART_MAX_POINTS):
+    """`series` without NaNs, reduced to at most `max_points` points with LTTB"""
+    series = series.dropna()
+    if len(series) <= max_points:
+        return series
+    index = series.index
+    x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(series))
+    x = (x - x[0]).astype(np.float64)
+    return series.iloc[lttb_indices(x, series.to_numpy(dtype=np.float64), max_points)]
+
+def thin_markers(markers, bars, max_points=CHART_MAX_POINTS):
+    """
+    Signal rows to draw: all of them when they fit in `max_points`, else the
+    first one within each of `bars` (the aggregated candles), so the count
+    stays bounded and every marker still sits on its exact signal bar.
+    """
+    if len(markers) <= max_points:
+        return markers
+    bucket = bars.index.searchsorted(markers.index)
+    return markers[np.r_[True, bucket[1:] != bucket[:-1]]]
+
+def scatter_trace(n_points, threshold=CHART_WEBGL_THRESHOLD):
+    """Scatter trace class for a series of `n_points`: WebGL above `threshold`"""
+    return go.Scattergl if n_points > threshold else go.Scatter
+
+def line_trace(series, max_points=CHART_MAX_POINTS, **kwargs):
+    """Line trace of `series`, LTTB-downsampled to `max_points` and drawn with WebGL when long"""
+    points = downsample_series(series, max_points)
+    return scatter_trace(len(points))(x=points.index, y=points.to_numpy(), **kwargs)
+
+# Shared look of the dashboard charts
+CHART_LAYOUT = dict(
+    xaxis_rangeslider_visible=False,
+    template="plotly_dark",
+    margin=dict(l=20, r=20, t=60, b=20),
+    plot_bgcolor="#2c3e50",
+    paper_bgcolor="#1e1e2f",
+)
+
+def _styled(fig, title, height):
+    fig.update_layout(title=dict(text=f"<b>{title}</b>", x=0.5, font=dict(color='#f0f2f6')), height=height,
+                      **CHART_LAYOUT)
+    return fig
+
+def price_figure(df, symbol, show_sma=True, show_ema=True, show_bollinger=False, max_points=CHART_MAX_POINTS):
+    """
+    Candlesticks with the enabled overlays and BUY/SELL markers. Long
+    histories become weekly/monthly candles and LTTB-downsampled lines, so
+    the payload stays bounded; markers keep their exact bars.
+    """
+    candles, candle_period = aggregate_ohlc(df, max_points)
+    fig = go.Figure(go.Candlestick(
+        x=candles.index,
+        open=candles["Open"], high=candles["High"], low=candles["Low"], close=candles["Close"],
+        name="Price" if candle_period == "Daily" else f"Price ({candle_period})",
+        increasing_line_color='#26a69a', decreasing_line_color='#ef5350'
+    ))
+
+    if show_sma and "SMA_20" in df.columns:
+        fig.add_trace(line_trace(df["SMA_20"], max_points, line=dict(color="#3498db", width=2), name="SMA 20"))
+    if show_sma and "SMA_50" in df.columns:
+        fig.add_trace(line_trace(df["SMA_50"], max_points, line=dict(color="#e74c3c", width=2), name="SMA 50"))
+    if show_ema and "EMA_20" in df.columns:
+        fig.add_trace(line_trace(df["EMA_20"], max_points, line=dict(color="#9b59b6", width=2, dash='dash'),
+                                 name="EMA 20"))
+    if show_bollinger and "BB_Upper" in df.columns:
+        fig.add_trace(line_trace(df["BB_Upper"], max_points, line=dict(color="#95a5a6", width=1), name="BB Upper"))
+        fig.add_trace(line_trace(df["BB_Lower"], max_points, line=dict(color="#95a5a6", width=1), name="BB Lower",
+                                 fill='tonexty', fillcolor='rgba(149, 165, 166, 0.1)'))
+
+    # One pass over the int8 signal codes instead of a string filter per side
+    codes = signal_codes(df["Signal"])
+    markers = (
+        (BUY, "Low", 0.98, 'triangle-up', '#2ecc71', 'Buy Signal'),
+        (SELL, "High", 1.02, 'triangle-down', '#e74c3c', 'Sell Signal'),
+    )
+    for code, column, offset, shape, color, name in markers:
+        signals = thin_markers(df[[column]].iloc[np.flatnonzero(codes == code)], candles, max_points)
+        if not signals.empty:
+            fig.add_trace(scatter_trace(len(signals))(
+                x=signals.index,
+                y=signals[column].to_numpy() * offset,
+                mode='markers',
+                marker=dict(symbol=shape, size=12, color=color, line=dict(width=1, color='white')),
+                name=name
+            ))
+    return _styled(fig, f"Price & Moving Averages for {symbol}", 600)
+
+def volume_figure(df, symbol, max_points=CHART_MAX_POINTS):
+    """Volume bars, summed per candle when the history is aggregated"""
+    candles, candle_period = aggregate_ohlc(df, max_points)
+    fig = go.Figure(go.Bar(x=candles.index, y=candles['Volume'], name='Volume', marker_color='#3498db'))
+    return _styled(fig, f"{candle_period} Volume for {symbol}", 250)
+
+def indicator_figure(df, symbol, show_rsi=True, show_macd=True, rsi_oversold=35, rsi_overbought=65,
+                     max_points=CHART_MAX_POINTS):
+    """RSI with its threshold lines and MACD with a colored histogram"""
+    fig = go.Figure()
+    if show_rsi and "RSI" in df.columns:
+        fig.add_trace(line_trace(df['RSI'], max_points, name='RSI', line=dict(color='#9b59b6')))
+        fig.add_hline(y=rsi_overbought, line_dash="dash", line_color="#e74c3c", annotation_text="Overbought")
+        fig.add_hline(y=rsi_oversold, line_dash="dash", line_color="#2ecc71", annotation_text="Oversold")
+
+    if show_macd and "MACD" in df.columns:
+        fig.add_trace(line_trace(df['MACD'], max_points, name='MACD', line=dict(color='#3498db')))
+        fig.add_trace(line_trace(df['Signal_Line'], max_points, name='Signal Line', line=dict(color='#e74c3c', dash='dot')))
+        histogram = downsample_series(df['MACD_Histogram'], max_points)
+        fig.add_trace(go.Bar(
+            x=histogram.index, y=histogram.to_numpy(), name='MACD Hist',
+            marker_color=np.where(histogram.to_numpy() > 0, '#2ecc71', '#e74c3c')
+        ))
+    return _styled(fig, f"RSI & MACD for {symbol}", 350)
+
+def intraday_figure(df, symbol, interval):
+    """
+    Live intraday candles with SMA 20 / EMA 20. `uirevision` keeps the user's
+    zoom and pan when the figure is redrawn with newly polled bars.
+    """
+    fig = go.Figure(go.Candlestick(
+        x=df.index, open=df["Open"], high=df["High"], low=df["Low"], close=df["Close"], name="Price",
+        increasing_line_color='#26a69a', decreasing_line_color='#ef5350'
+    ))
+    fig.add_trace(line_trace(df["SMA_20"], line=dict(color="#3498db", width=2), name="SMA 20"))
+    fig.add_trace(line_trace(df["EMA_20"], line=dict(color="#9b59b6", width=2, dash='dash'), name="EMA 20"))
+    # Skip weekends and the hours the market is closed
+    fig.update_xaxes(rangebreaks=[dict(bounds=["sat", "mon"]), dict(bounds=[20, 4], pattern="hour")])
+    fig.update_layout(uirevision=f"{symbol}-{interval}")
+    return _styled(fig, f"{symbol} Intraday ({interval})", 450)
@@ -0,0 +1,89 @@
+# dashboard/pages/screener.py
+import re
+import sys
+import os
+import streamlit as st
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from models.screener import screen_watchlist
+from models.strategy import Strategy
+from services.batch_fetch import fetch_many
+from services.compute import get_compute_service
+from config import DEFAULT_WATCHLIST
+
+st.set_page_config(page_title="Yami-stocks Pro - Watchlist Screener", layout="wide")
+
+st.title("🔎 Watchlist Screener")
+st.caption("Latest signal for every symbol in the watchlist, computed from stored histories in one batched pass.")
+
+# --------------------------
+# Watchlist & Rules
+# --------------------------
+st.sidebar.markdown("### Watchlist")
+watchlist_text = st.sidebar.text_area("Symbols", value=DEFAULT_WATCHLIST.replace(",", ", "), height=150,
+                                      help="Separate symbols with commas, spaces or new lines")
+uploaded = st.sidebar.file_uploader("...or upload a symbol list", type=["txt", "csv"])
+if uploaded is not None:
+    watchlist_text = uploaded.getvalue().decode("utf-8", errors="ignore")
+symbols = [s.upper() for s in re.split(r"[\s,;]+", watchlist_text) if s]
+
+history = st.sidebar.selectbox("History", ["compact", "full"], help="Which stored series to screen")
+fetch_missing = st.sidebar.checkbox("Fetch symbols without stored history", value=False,
+                                    help="Uses the API budget; large watchlists take several minutes on the free tier")
+
+st.sidebar.markdown("### Signal Rules")
+rsi_oversold = st.sidebar.slider("RSI Oversold Level", 20, 40, 35)
+rsi_overbought = st.sidebar.slider("RSI Overbought Level", 60, 80, 65)
+min_votes = st.sidebar.slider("Conditions required", 1, 4, 2)
+strategy = Strategy(rsi_oversold=rsi_oversold, rsi_overbought=rsi_overbought, min_votes=min_votes)
+
+# --------------------------
+# Screen
+# --------------------------
+def run_screen(symbols, history, strategy):
+    """`screen_watchlist` in a compute worker when one is configured"""
+    service = get_compute_service()
+    if service is None:
+        return screen_watchlist(symbols, history, strategy)
+    return service.screen(symbols, history, strategy).result()
+
+if fetch_missing:
+    table = run_screen(symbols, history, strategy)
+    missing = table.loc[table["Error"].notna(), "Symbol"].tolist()
+    if missing:
+        progress = st.progress(0.0, text=f"Fetching {len(missing)} symbols...")
+        for done, (symbol, _, error) in enumerate(fetch_many(missing, history), start=1):
+            progress.progress(done / len(missing), text=f"Fetched {symbol}" + (f" (failed: {error})" if error else ""))
+        progress.empty()
+
+with st.spinner(f"Screening {len(symbols)} symbols..."):
+    table = run_screen(symbols, history, strategy)
+
+screened = table[table["Error"].isna()]
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Screened", len(screened))
+col2.metric("BUY", int((screened["Signal"] == "BUY").sum()))
+col3.metric("SELL", int((screened["Signal"] == "SELL").sum()))
+col4.metric("No stored history", len(table) - len(screened))
+
+show = st.multiselect("Show signals", ["BUY", "SELL", "HOLD"], default=["BUY", "SELL"])
+view = screened[screened["Signal"].isin(show)].drop(columns=["Error"])
+st.dataframe(
+    view,
+    hide_index=True,
+    width='stretch',
+    column_config={
+        "Date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+        "Close": st.column_config.NumberColumn("Close", format="%.2f"),
+        "RSI": st.column_config.NumberColumn("RSI", format="%.1f"),
+        "Volume_Ratio": st.column_config.NumberColumn("Volume Ratio", format="%.2f"),
+        "Change_5d": st.column_config.NumberColumn("5d Change", format="percent"),
+    },
+)
+
+errors = table[table["Error"].notna()]
+if not errors.empty:
+    with st.expander(f"{len(errors)} symbols without stored history"):
+        st.write(", ".join(errors["Symbol"]))
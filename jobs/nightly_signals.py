@@ -0,0 +1,157 @@
+# jobs/nightly_signals.py
+"""
+Headless fetch -> add_indicators -> generate_signals run over a symbol universe.
+
+    python jobs/nightly_signals.py --universe data/universe.txt [--outputsize full]
+
+Each symbol's frame is written to a partitioned Parquet store (see
+services/signal_store.py) together with a latest-signal table for the run.
+Progress is checkpointed after every symbol; when the API rate limit stops
+the run, it exits with status 75 and rerunning resumes where it left off.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from config import SIGNALS_DIR
+from models.model import generate_signals
+from services.alphavantage_api import RateLimitError, cached_daily_data
+from services.batch_fetch import fetch_many
+from services.indicator_graph import registered_indicators
+from services.indicators import RSI_METHODS, add_indicators
+from services.market_calendar import last_completed_trading_day
+from services.signal_store import read_history, write_history, write_screen
+
+EXIT_FAILED = 1
+# EX_TEMPFAIL: try again later
+EXIT_RESUME = 75
+
+SCREEN_FIELDS = ["Close", "Signal", "Signal_Mask", "RSI", "MACD", "Signal_Line", "SMA_20", "SMA_50"]
+
+def read_universe(path):
+    """Symbols listed in a text file (one or more per line, '#' comments), deduplicated"""
+    symbols = []
+    with open(path) as f:
+        for line in f:
+            symbols.extend(s.upper() for s in re.split(r"[\s,;]+", line.split("#", 1)[0]) if s)
+    return list(dict.fromkeys(symbols))
+
+class Checkpoint:
+    """Symbols already processed in a run, persisted as JSON after every change"""
+
+    def __init__(self, path, run_key):
+        self.path = path
+        self.run_key = run_key
+        self.done = []
+        self.failed = {}
+
+    @classmethod
+    def open(cls, path, run_key, resume=True):
+        """Resume the stored checkpoint if it belongs to the same run, else start empty"""
+        checkpoint = cls(path, run_key)
+        if resume:
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            if state.get("run_key") == run_key:
+                checkpoint.done = state.get("done", [])
+                checkpoint.failed = state.get("failed", {})
+        return checkpoint
+
+    def mark_done(self, symbol):
+        self.done.append(symbol)
+        self.failed.pop(symbol, None)
+        self.save()
+
+    def mark_failed(self, symbol, error):
+        self.failed[symbol] = str(error)
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"run_key": self.run_key, "done": self.done, "failed": self.failed}, f)
+        os.replace(tmp_path, self.path)
+
+def process_symbol(symbol, df, outputsize, rsi_method, run_date, root):
+    """Compute every registered indicator plus signals for one symbol and store them"""
+    frame = generate_signals(add_indicators(df.copy(), rsi_method=rsi_method, columns=registered_indicators()))
+    fetched_at = cached_daily_data(symbol, outputsize)[1].get("fetched_at")
+    write_history(symbol, outputsize, frame, root, rsi_method=rsi_method, fetched_at=fetched_at,
+                  run_date=str(run_date))
+    return frame
+
+def latest_signals(symbols, outputsize, root):
+    """One row per stored symbol with its last bar's signal and indicators"""
+    rows = []
+    for symbol in symbols:
+        df, _ = read_history(symbol, outputsize, columns=SCREEN_FIELDS, root=root)
+        if df is not None and not df.empty:
+            rows.append({"Symbol": symbol, "Date": df.index[-1], **df.iloc[-1].to_dict()})
+    table = pd.DataFrame(rows, columns=["Symbol", "Date", *SCREEN_FIELDS])
+    table["Signal_Mask"] = table["Signal_Mask"].astype(np.uint16)
+    return table
+
+def run(symbols, outputsize="compact", root=SIGNALS_DIR, workers=4, rsi_method="sma", run_date=None,
+        resume=True, max_retries=5, log=print):
+    """Process `symbols` end to end; returns a process exit status"""
+    run_date = run_date or last_completed_trading_day().date()
+    run_key = f"{run_date}:{outputsize}:{rsi_method}"
+    checkpoint = Checkpoint.open(os.path.join(root, "_checkpoints", f"{outputsize}.json"), run_key, resume)
+    pending = [symbol for symbol in symbols if symbol not in set(checkpoint.done)]
+    log(f"{run_key}: {len(symbols)} symbols, {len(symbols) - len(pending)} already done, {len(pending)} to go")
+
+    interrupted = False
+    for symbol, df, error in fetch_many(pending, outputsize, max_workers=workers, max_retries=max_retries):
+        if isinstance(error, RateLimitError):
+            interrupted = True
+            log(f"Rate limit reached at {symbol}: {error}")
+            break
+        if error is None:
+            try:
+                process_symbol(symbol, df, outputsize, rsi_method, run_date, root)
+            except Exception as e:
+                error = e
+        if error is None:
+            checkpoint.mark_done(symbol)
+            log(f"  {symbol}: ok ({len(checkpoint.done)}/{len(symbols)})")
+        else:
+            checkpoint.mark_failed(symbol, error)
+            log(f"  {symbol}: failed - {error}")
+
+    if interrupted:
+        log(f"Stopped after {len(checkpoint.done)}/{len(symbols)} symbols; rerun the same command to resume")
+        return EXIT_RESUME
+
+    table = latest_signals(checkpoint.done, outputsize, root)
+    write_screen(run_date, outputsize, table, root, rsi_method=rsi_method, failed=checkpoint.failed)
+    counts = table["Signal"].value_counts().to_dict() if not table.empty else {}
+    log(f"Wrote {len(table)} symbols for {run_date}: {counts}; {len(checkpoint.failed)} failed")
+    return EXIT_FAILED if checkpoint.failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--universe", required=True, help="Text file of symbols")
+    parser.add_argument("--outputsize", choices=("compact", "full"), default="compact")
+    parser.add_argument("--out", default=SIGNALS_DIR, help="Root of the Parquet store")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent API requests")
+    parser.add_argument("--rsi-method", choices=RSI_METHODS, default="sma")
+    parser.add_argument("--run-date", help="Label of the run (default: last completed trading day)")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per symbol after a rate-limit reply")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore an existing checkpoint for this run")
+    args = parser.parse_args(argv)
+
+    return run(read_universe(args.universe), args.outputsize, args.out, args.workers, args.rsi_method,
+               args.run_date, resume=not args.no_resume, max_retries=args.max_retries)
+
+if __name__ == "__main__":
+    sys.exit(main())
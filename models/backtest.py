@@ -0,0 +1,159 @@
+# models/backtest.py
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from models.strategy import BUY, HOLD, SELL, SIGNAL_LABELS
+
+POSITION_MODES = ("long_only", "long_short")
+TRADING_DAYS = 252
+
+@dataclass
+class BacktestResult:
+    """Per-bar simulation plus the trade list and summary statistics"""
+    equity: pd.Series
+    returns: pd.Series
+    positions: pd.Series
+    trades: pd.DataFrame
+    stats: dict
+
+def signal_codes(signal):
+    """int8 HOLD/BUY/SELL codes from a `Signal` column (categorical or strings)"""
+    if isinstance(signal.dtype, pd.CategoricalDtype) and tuple(signal.cat.categories) == SIGNAL_LABELS:
+        return signal.cat.codes.to_numpy()
+    values = np.asarray(signal)
+    codes = np.full(len(values), HOLD, dtype=np.int8)
+    codes[values == "BUY"] = BUY
+    codes[values == "SELL"] = SELL
+    return codes
+
+def signal_positions(codes, mode="long_only"):
+    """
+    Position held after each bar's close: BUY goes long, SELL goes flat
+    (long_only) or short (long_short), HOLD keeps the previous position.
+    """
+    if mode not in POSITION_MODES:
+        raise ValueError(f"Unknown position mode {mode!r}, expected one of {POSITION_MODES}")
+    codes = np.asarray(codes)
+    target = np.zeros(len(codes), dtype=np.int8)
+    target[codes == BUY] = 1
+    if mode == "long_short":
+        target[codes == SELL] = -1
+
+    # Carry the last decided target forward through HOLD bars
+    last = np.where(codes != HOLD, np.arange(len(codes)), -1)
+    np.maximum.accumulate(last, out=last)
+    positions = target[last]
+    positions[last < 0] = 0
+    return positions
+
+def _trade_spans(positions):
+    """(entry, exit, is_open) bar indices of each stretch of constant non-zero position"""
+    changes = np.flatnonzero(np.diff(positions, prepend=0))
+    exits = np.append(changes[1:], len(positions) - 1)
+    is_open = np.zeros(len(changes), dtype=bool)
+    is_open[-1:] = True
+    entries = positions[changes] != 0
+    return changes[entries], exits[entries], is_open[entries]
+
+def _trade_returns(close, positions, entries, exits, is_open, cost):
+    gross = positions[entries] * (close[exits] / close[entries] - 1)
+    # Entry plus exit costs; open trades have only paid to get in
+    return (1 + gross) * (1 - cost) ** np.where(is_open, 1, 2) - 1
+
+def simulate(close, codes, mode="long_only", cost=0.0):
+    """
+    Core per-bar simulation on plain arrays: returns (positions, held,
+    turnover, returns), where `held` is the position earning each bar's return.
+    """
+    positions = signal_positions(codes, mode)
+    bar_returns = np.zeros(len(close))
+    np.divide(close[1:], close[:-1], out=bar_returns[1:])
+    bar_returns[1:] -= 1
+    held = np.zeros(len(close))
+    held[1:] = positions[:-1]
+    turnover = np.abs(np.diff(positions, prepend=0))
+    # Costs are paid out of the equity at the trade's close
+    returns = (1 + held * bar_returns) * (1 - turnover * cost) - 1
+    return positions, held, turnover, returns
+
+def _years(index, bars, periods_per_year):
+    if isinstance(index, pd.DatetimeIndex) and len(index) > 1:
+        return (index[-1] - index[0]).days / 365.25
+    return bars / periods_per_year
+
+def summarize_returns(returns, years=None, periods_per_year=TRADING_DAYS, growth=None):
+    """
+    Total return, CAGR, Sharpe and max drawdown of a per-bar return series
+    (the first bar is treated as the starting point and excluded from Sharpe).
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    growth = np.cumprod(1 + returns) if growth is None else growth
+    years = len(returns) / periods_per_year if years is None else years
+    drawdown = growth / np.maximum.accumulate(growth) - 1 if len(growth) else growth
+    std = returns[1:].std(ddof=1) if len(returns) > 2 else np.nan
+    final = growth[-1] if len(growth) else 1.0
+    return {
+        "total_return": float(final - 1),
+        "cagr": float(final ** (1 / years) - 1) if years > 0 and final > 0 else np.nan,
+        "sharpe": float(returns[1:].mean() / std * np.sqrt(periods_per_year)) if std > 0 else np.nan,
+        "max_drawdown": float(drawdown.min()) if len(drawdown) else 0.0,
+    }
+
+def _stats(returns, growth, held, turnover, trade_returns, is_open, years, periods_per_year):
+    closed = trade_returns[~is_open]
+    return {
+        **summarize_returns(returns, years, periods_per_year, growth),
+        "trades": len(trade_returns),
+        "hit_rate": float((closed > 0).mean()) if len(closed) else np.nan,
+        "exposure": float(np.count_nonzero(held) / len(held)) if len(held) else 0.0,
+        "turnover": float(turnover.sum()),
+    }
+
+def backtest_stats(close, codes, mode="long_only", commission=0.0, slippage=0.0,
+                   years=None, periods_per_year=TRADING_DAYS):
+    """
+    Summary stats of `run_backtest` straight from a close array and signal
+    codes, without building any pandas objects (for parameter sweeps).
+    """
+    cost = commission + slippage
+    positions, held, turnover, returns = simulate(close, codes, mode, cost)
+    entries, exits, is_open = _trade_spans(positions)
+    trade_returns = _trade_returns(close, positions, entries, exits, is_open, cost)
+    years = len(close) / periods_per_year if years is None else years
+    return _stats(returns, np.cumprod(1 + returns), held, turnover, trade_returns, is_open, years, periods_per_year)
+
+def run_backtest(df: pd.DataFrame, mode="long_only", commission=0.0, slippage=0.0,
+                 initial_capital=10_000.0, periods_per_year=TRADING_DAYS):
+    """
+    Simulate trading the `Signal` column of `generate_signals` at each bar's
+    close, fully vectorised.
+
+    A signal on bar t sets the position held from t's close to t+1's close.
+    `commission` and `slippage` are fractions of traded notional (0.0005 is
+    5 bps) charged on every unit of position change.
+    """
+    close = df["Close"].to_numpy(dtype=np.float64)
+    cost = commission + slippage
+    positions, held, turnover, returns = simulate(close, signal_codes(df["Signal"]), mode, cost)
+    growth = np.cumprod(1 + returns)
+
+    entries, exits, is_open = _trade_spans(positions)
+    trade_returns = _trade_returns(close, positions, entries, exits, is_open, cost)
+    trades = pd.DataFrame({
+        "Entry": df.index[entries],
+        "Exit": df.index[exits],
+        "Side": np.where(positions[entries] > 0, "LONG", "SHORT"),
+        "Entry_Price": close[entries],
+        "Exit_Price": close[exits],
+        "Bars": exits - entries,
+        "Return": trade_returns,
+        "Open": is_open,
+    })
+    years = _years(df.index, len(close), periods_per_year)
+    return BacktestResult(
+        equity=pd.Series(initial_capital * growth, index=df.index, name="Equity"),
+        returns=pd.Series(returns, index=df.index, name="Return"),
+        positions=pd.Series(positions, index=df.index, name="Position"),
+        trades=trades,
+        stats=_stats(returns, growth, held, turnover, trade_returns, is_open, years, periods_per_year),
+    )
@@ -0,0 +1,133 @@
+# models/metrics.py
+from dataclasses import dataclass
+import numpy as np
+from models.backtest import TRADING_DAYS, signal_codes
+from models.strategy import SIGNAL_LABELS
+from services.indicators import rolling_mean
+
+# Bars summarised by the "recent" card and table values
+RECENT_BARS = 20
+VOLUME_WINDOW = 20
+
+@dataclass(frozen=True)
+class MarketMetrics:
+    """
+    Every card and table value of one price window. Percentages are in
+    percent; `recent_*` fields cover the last `RECENT_BARS` bars, and the
+    per-bar arrays are aligned with those bars.
+    """
+    price: float
+    price_change: float
+    price_change_pct: float
+    period_return: float
+    volume: float
+    avg_volume: float
+    volume_ratio: float
+    volatility: float
+    sharpe: float
+    max_drawdown: float
+    rsi: float
+    sma_20: float
+    price_vs_sma20: float
+    signal_counts: dict
+    recent_avg_close: float
+    recent_high: float
+    recent_low: float
+    recent_volume: float
+    recent_avg_volume: float
+    recent_avg_rsi: float
+    recent_signal_counts: dict
+    change_pct: np.ndarray
+    volume_ratios: np.ndarray
+    vs_sma20: np.ndarray
+
+def _column(df, name):
+    return df[name].to_numpy(dtype=np.float64) if name in df.columns else np.full(len(df), np.nan)
+
+def _counts(codes):
+    return dict(zip(SIGNAL_LABELS, np.bincount(codes, minlength=len(SIGNAL_LABELS)).tolist()))
+
+def market_metrics(df, recent=RECENT_BARS, periods_per_year=TRADING_DAYS):
+    """All dashboard metrics of `df` (OHLCV, RSI, SMA_20 and Signal columns) from one pass over its arrays"""
+    close = _column(df, "Close")
+    volume = _column(df, "Volume")
+    rsi = _column(df, "RSI")
+    sma_20 = _column(df, "SMA_20")
+    n = len(close)
+    if n == 0:
+        raise ValueError("market_metrics needs at least one bar")
+
+    returns = close[1:] / close[:-1] - 1
+    std = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    drawdown = running_drawdown(close)
+
+    # The volume average is only needed over the recent bars
+    tail = slice(max(0, n - recent), n)
+    volume_average = rolling_mean(volume[max(0, tail.start - VOLUME_WINDOW + 1):], VOLUME_WINDOW)[tail.start - n:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_ratios = volume[tail] / volume_average
+        vs_sma20 = (close[tail] - sma_20[tail]) / sma_20[tail] * 100
+    change_pct = np.full(n, np.nan)
+    change_pct[1:] = returns * 100
+
+    codes = signal_codes(df["Signal"]) if "Signal" in df.columns else np.zeros(n, dtype=np.int8)
+    prev_price = close[-2] if n > 1 else close[-1]
+    avg_volume = volume_average[-1]
+    return MarketMetrics(
+        price=float(close[-1]),
+        price_change=float(close[-1] - prev_price),
+        price_change_pct=float((close[-1] - prev_price) / prev_price * 100),
+        period_return=float((close[-1] - close[0]) / close[0] * 100),
+        volume=float(volume[-1]),
+        avg_volume=float(avg_volume),
+        volume_ratio=float(volume[-1] / avg_volume) if avg_volume > 0 else 1.0,
+        volatility=float(std * np.sqrt(periods_per_year) * 100),
+        sharpe=float(returns.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0,
+        max_drawdown=float(drawdown.min() * 100),
+        rsi=float(rsi[-1]),
+        sma_20=float(sma_20[-1]),
+        price_vs_sma20=float(vs_sma20[-1]),
+        signal_counts=_counts(codes),
+        recent_avg_close=float(close[tail].mean()),
+        recent_high=float(_column(df, "High")[tail].max()),
+        recent_low=float(_column(df, "Low")[tail].min()),
+        recent_volume=float(volume[tail].sum()),
+        recent_avg_volume=float(volume[tail].mean()),
+        recent_avg_rsi=float(np.nanmean(rsi[tail])) if not np.isnan(rsi[tail]).all() else np.nan,
+        recent_signal_counts=_counts(codes[tail]),
+        change_pct=change_pct[tail],
+        volume_ratios=volume_ratios,
+        vs_sma20=vs_sma20,
+    )
+
+def running_drawdown(close):
+    """Fractional drop of each bar from the highest close so far"""
+    close = np.asarray(close, dtype=np.float64)
+    return close / np.maximum.accumulate(close) - 1 if len(close) else close
+
+def _rolling_moments(returns, window):
+    """Trailing mean and sample std over `window` bars from cumulative sums (O(n))"""
+    returns = np.asarray(returns, dtype=np.float64)
+    mean = np.full(len(returns), np.nan)
+    std = np.full(len(returns), np.nan)
+    if window < 2 or len(returns) < window:
+        return mean, std
+    # Centering first keeps the running sums small and the variance accurate
+    centered = returns - returns.mean()
+    s1 = np.concatenate([[0.0], np.cumsum(centered)])
+    s2 = np.concatenate([[0.0], np.cumsum(centered * centered)])
+    sum1 = s1[window:] - s1[:-window]
+    sum2 = s2[window:] - s2[:-window]
+    mean[window - 1:] = sum1 / window + returns.mean()
+    std[window - 1:] = np.sqrt(np.maximum(sum2 - sum1 * sum1 / window, 0.0) / (window - 1))
+    return mean, std
+
+def rolling_volatility(returns, window=63, periods_per_year=TRADING_DAYS):
+    """Annualised trailing volatility of per-bar returns (fraction, NaN until `window` bars)"""
+    return _rolling_moments(returns, window)[1] * np.sqrt(periods_per_year)
+
+def rolling_sharpe(returns, window=63, periods_per_year=TRADING_DAYS):
+    """Annualised trailing Sharpe ratio of per-bar returns (NaN until `window` bars)"""
+    mean, std = _rolling_moments(returns, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, mean / std * np.sqrt(periods_per_year), np.nan)
@@ -0,0 +1,195 @@
+# models/optimizer.py
+import itertools
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from models.backtest import TRADING_DAYS, backtest_stats
+from models.model import SIGNAL_INDICATORS
+from models.strategy import DEFAULT_STRATEGY, SignalInputs, compile_strategy
+from services.indicators import add_indicators
+
+# Thresholds generate_signals used to hardcode, with values worth trying
+DEFAULT_SPACE = {
+    "rsi_oversold": (25, 30, 35, 40),
+    "rsi_overbought": (60, 65, 70, 75),
+    "volume_ratio": (1.0, 1.2, 1.5),
+    "momentum": (0.01, 0.02, 0.03),
+    "min_votes": (1, 2, 3),
+}
+
+SCORE_METRICS = ("sharpe", "total_return", "cagr", "max_drawdown", "hit_rate")
+
+def grid_params(space=None):
+    """Every combination of the values in `space` ({field: values})"""
+    space = space or DEFAULT_SPACE
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_params(space=None, n_iter=100, seed=None):
+    """`n_iter` distinct combinations drawn uniformly from the grid of `space`"""
+    space = space or DEFAULT_SPACE
+    names = list(space)
+    sizes = [len(space[name]) for name in names]
+    total = math.prod(sizes)
+    rng = random.Random(seed)
+    params = []
+    for flat in rng.sample(range(total), min(n_iter, total)):
+        combo = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            flat, pick = divmod(flat, size)
+            combo[name] = space[name][pick]
+        params.append({name: combo[name] for name in names})
+    return params
+
+def prepare_inputs(frames, rsi_method="sma"):
+    """
+    Compute indicators and rule inputs once per symbol from raw OHLCV frames.
+    Returns ({symbol: SignalInputs}, {symbol: years of history}).
+    """
+    inputs, years = {}, {}
+    for symbol, df in frames.items():
+        # add_indicators adds columns in place; keep the caller's frames untouched
+        inputs[symbol] = SignalInputs(add_indicators(df[["Close", "Volume"]].copy(), rsi_method=rsi_method,
+                                                     columns=SIGNAL_INDICATORS))
+        if not isinstance(df.index, pd.DatetimeIndex):
+            years[symbol] = len(df) / TRADING_DAYS
+        else:
+            years[symbol] = (df.index[-1] - df.index[0]).days / 365.25 if len(df) > 1 else 0.0
+    return inputs, years
+
+class SharedInputs:
+    """
+    Rule inputs of many symbols packed into shared memory, one block per field
+    with symbols laid end to end. Workers map the blocks read-only through
+    `layout` instead of receiving pickled copies.
+    """
+
+    def __init__(self, inputs):
+        self.symbols = list(inputs)
+        lengths = [len(inputs[symbol]) for symbol in self.symbols]
+        self.offsets = np.concatenate([[0], np.cumsum(lengths)]).tolist()
+        fields = [name for name in SignalInputs.FIELDS
+                  if all(getattr(inputs[symbol], name) is not None for symbol in self.symbols)]
+
+        self.blocks = {}
+        self.layout = {"symbols": self.symbols, "offsets": self.offsets, "fields": {}}
+        try:
+            for name in fields:
+                dtype = getattr(inputs[self.symbols[0]], name).dtype
+                block = shared_memory.SharedMemory(create=True, size=max(1, self.offsets[-1] * dtype.itemsize))
+                self.blocks[name] = block
+                packed = np.ndarray(self.offsets[-1], dtype=dtype, buffer=block.buf)
+                for symbol, start, end in zip(self.symbols, self.offsets, self.offsets[1:]):
+                    packed[start:end] = getattr(inputs[symbol], name)
+                self.layout["fields"][name] = (block.name, dtype.str)
+        except Exception:
+            self.close()
+            raise
+
+    @staticmethod
+    def attach(layout):
+        """Map the blocks described by `layout`; returns (blocks, {symbol: SignalInputs})"""
+        blocks, arrays = {}, {}
+        total = layout["offsets"][-1]
+        for name, (block_name, dtype) in layout["fields"].items():
+            # Pool workers share the creator's resource tracker, which
+            # unlinks the block once the creating process releases it
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks[name] = block
+            arrays[name] = np.ndarray(total, dtype=dtype, buffer=block.buf)
+            arrays[name].flags.writeable = False
+
+        offsets = layout["offsets"]
+        inputs = {
+            symbol: SignalInputs.from_arrays({name: values[start:end] for name, values in arrays.items()})
+            for symbol, start, end in zip(layout["symbols"], offsets, offsets[1:])
+        }
+        return blocks, inputs
+
+    def close(self):
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Per-process state set up by `_init_worker`
+_worker = {}
+
+def _init_worker(layout, years):
+    _worker["blocks"], _worker["inputs"] = SharedInputs.attach(layout)
+    _worker["years"] = years
+
+def evaluate_params(params, inputs, years, base=DEFAULT_STRATEGY, metric="sharpe",
+                    mode="long_only", commission=0.0, slippage=0.0):
+    """Backtest one parameter combination on every symbol; returns a result row"""
+    compiled = compile_strategy(base.replace(**params))
+    per_symbol = [
+        backtest_stats(x.close, compiled.codes(compiled.mask(x)), mode, commission, slippage, years[symbol])
+        for symbol, x in inputs.items()
+    ]
+    row = dict(params)
+    with np.errstate(invalid="ignore"):
+        for name in SCORE_METRICS:
+            values = np.array([stats[name] for stats in per_symbol], dtype=np.float64)
+            row[name] = float(np.nanmean(values)) if not np.isnan(values).all() else np.nan
+    row["trades"] = sum(stats["trades"] for stats in per_symbol)
+    row["score"] = row[metric]
+    return row
+
+def _evaluate_chunk(chunk, options):
+    return [evaluate_params(params, _worker["inputs"], _worker["years"], **options) for params in chunk]
+
+def sweep(frames, params=None, base=DEFAULT_STRATEGY, metric="sharpe", mode="long_only",
+          commission=0.0, slippage=0.0, rsi_method="sma", max_workers=None, chunksize=None):
+    """
+    Score parameter combinations over several symbols and yield result rows
+    as they complete.
+
+    Indicators are computed once per symbol and shared read-only with a pool
+    of worker processes through shared memory; each combination (a dict of
+    `Strategy` fields, see `grid_params` / `random_params`) is backtested on
+    every symbol and scored by the mean of `metric`.
+    """
+    if metric not in SCORE_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {SCORE_METRICS}")
+    params = grid_params() if params is None else list(params)
+    options = {"base": base, "metric": metric, "mode": mode, "commission": commission, "slippage": slippage}
+    inputs, years = prepare_inputs(frames, rsi_method)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    if max_workers == 1:
+        for combo in params:
+            yield evaluate_params(combo, inputs, years, **options)
+        return
+
+    # Several chunks per worker keeps the pool busy without per-combination IPC
+    chunksize = chunksize or max(1, math.ceil(len(params) / (max_workers * 8)))
+    chunks = [params[i:i + chunksize] for i in range(0, len(params), chunksize)]
+    with SharedInputs(inputs) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.layout, years)) as pool:
+            futures = [pool.submit(_evaluate_chunk, chunk, options) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+def rank_results(rows, metric="score"):
+    """Result rows as a table, best `metric` first"""
+    table = pd.DataFrame(list(rows))
+    if table.empty:
+        return table
+    return table.sort_values(metric, ascending=False, na_position="last").reset_index(drop=True)
+
+def optimize(frames, params=None, top=None, **options):
+    """Run `sweep` to completion and return the ranked table (optionally the `top` rows)"""
+    table = rank_results(sweep(frames, params, **options))
+    return table if top is None else table.head(top)
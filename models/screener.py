@@ -0,0 +1,94 @@
+# models/screener.py
+import numpy as np
+import pandas as pd
+from models.strategy import (DEFAULT_STRATEGY, SIGNAL_LABELS, SignalInputs, compile_strategy,
+                             explain, signal_scores)
+from services.alphavantage_api import cached_daily_data
+from services.batch_indicators import compute_indicator_panel
+
+# Trailing bars screened per symbol. The latest signal needs SMA_50 on the
+# last two bars (51 bars); the rest lets the EMA-based MACD and Wilder RSI,
+# which depend on all earlier bars, converge (0.93^250 < 1e-7 for span 26).
+SCREEN_BARS = 300
+
+SCREEN_COLUMNS = ["Symbol", "Date", "Close", "Signal", "Score", "Buy_Score", "Sell_Score",
+                  "RSI", "Volume_Ratio", "Change_5d", "Rules", "Error"]
+# Nullable integers, so rows without a score (errors) keep the columns integral
+SCORE_DTYPES = {"Score": "Int8", "Buy_Score": "UInt8", "Sell_Score": "UInt8"}
+
+def load_histories(symbols, outputsize="compact"):
+    """
+    Stored histories for a watchlist, straight from the local cache (no
+    network). Returns ({symbol: df}, {symbol: error message}).
+    """
+    frames, errors = {}, {}
+    for symbol in dict.fromkeys(s.strip().upper() for s in symbols if s.strip()):
+        df = cached_daily_data(symbol, outputsize)[0]
+        if df is None or df.empty:
+            errors[symbol] = "No stored history"
+        else:
+            frames[symbol] = df
+    return frames, errors
+
+def tail_panel(frames, column, bars=SCREEN_BARS):
+    """
+    (bars x symbols) array of each frame's last `bars` values of `column`,
+    aligned on the latest bar and NaN-padded at the top for short histories.
+    """
+    panel = np.full((bars, len(frames)), np.nan)
+    for j, df in enumerate(frames.values()):
+        values = df[column].to_numpy(dtype=np.float64)[-bars:]
+        panel[bars - len(values):, j] = values
+    return panel
+
+def screen(frames, strategy=DEFAULT_STRATEGY, bars=SCREEN_BARS, rsi_method="sma"):
+    """
+    Latest signal of every symbol in `frames` ({symbol: OHLCV frame}).
+
+    Only the trailing `bars` of each history are used: they are stacked into
+    one panel, indicators and rules are evaluated for all symbols in a single
+    vectorised pass and the last bar of each column is reported.
+    """
+    symbols = list(frames)
+    if not symbols:
+        return pd.DataFrame(columns=SCREEN_COLUMNS).astype(SCORE_DTYPES)
+    close = tail_panel(frames, "Close", bars)
+    panel = compute_indicator_panel(close, tail_panel(frames, "Volume", bars), rsi_method)
+
+    inputs = SignalInputs.from_columns(close, panel["SMA_20"], panel["SMA_50"], panel["RSI"],
+                                       panel["Volume_Ratio"], panel["MACD"], panel["Signal_Line"])
+    compiled = compile_strategy(strategy)
+    mask = compiled.mask(inputs)[-1]
+    buy_score, sell_score = signal_scores(mask)
+    codes = compiled.codes(mask)
+
+    table = pd.DataFrame({
+        "Symbol": symbols,
+        "Date": [df.index[-1] for df in frames.values()],
+        "Close": close[-1],
+        "Signal": pd.Categorical.from_codes(codes, categories=SIGNAL_LABELS),
+        "Score": pd.array(buy_score.astype(np.int8) - sell_score.astype(np.int8), dtype=SCORE_DTYPES["Score"]),
+        "Buy_Score": pd.array(buy_score, dtype=SCORE_DTYPES["Buy_Score"]),
+        "Sell_Score": pd.array(sell_score, dtype=SCORE_DTYPES["Sell_Score"]),
+        "RSI": panel["RSI"][-1],
+        "Volume_Ratio": panel["Volume_Ratio"][-1],
+        "Change_5d": inputs.change(strategy.momentum_days)[-1],
+        "Rules": [", ".join(explain(bits, strategy)) for bits in mask],
+        "Error": None,
+    })
+    return table.sort_values(["Signal", "Score"], ascending=[True, False], key=_signal_order).reset_index(drop=True)
+
+def _signal_order(column):
+    # BUY first, then SELL, then HOLD; other columns sort as they are
+    if column.name == "Signal":
+        return column.map({"BUY": 0, "SELL": 1, "HOLD": 2}).astype(np.int8)
+    return column
+
+def screen_watchlist(symbols, outputsize="compact", strategy=DEFAULT_STRATEGY, bars=SCREEN_BARS, rsi_method="sma"):
+    """`screen` over stored histories; symbols without one are listed last with an Error"""
+    frames, errors = load_histories(symbols, outputsize)
+    table = screen(frames, strategy, bars, rsi_method)
+    if errors:
+        missing = pd.DataFrame({"Symbol": list(errors), "Error": list(errors.values())})
+        table = pd.concat([table, missing], ignore_index=True).astype(SCORE_DTYPES)
+    return table
@@ -0,0 +1,227 @@
+# models/strategy.py
+from dataclasses import dataclass, fields
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from services.indicators import rolling_mean
+
+# One bit per rule in the uint16 `Signal_Mask`: buy rules in bits 0-5,
+# sell rules in bits 6-11
+BUY_CONDITIONS = ("sma_crossover", "rsi_oversold", "price_above_sma",
+                  "macd_bullish", "volume_confirmation", "positive_momentum")
+SELL_CONDITIONS = ("sma_crossunder", "rsi_overbought", "price_below_sma",
+                   "macd_bearish", "volume_decline", "negative_momentum")
+CONDITIONS = BUY_CONDITIONS + SELL_CONDITIONS
+SELL_SHIFT = len(BUY_CONDITIONS)
+SIDE_BITS = (1 << SELL_SHIFT) - 1
+
+# Labels are formatted with the strategy's fields
+CONDITION_LABELS = {
+    "sma_crossover": "SMA 20 crossed above SMA 50",
+    "rsi_oversold": "RSI below {rsi_oversold:g} and rising",
+    "price_above_sma": "Price above SMA 20 and rising",
+    "macd_bullish": "MACD crossed above signal line",
+    "volume_confirmation": "Volume {volume_ratio:g}x its 20-day average",
+    "positive_momentum": "Up more than {momentum:.0%} in {momentum_days} days",
+    "sma_crossunder": "SMA 20 crossed below SMA 50",
+    "rsi_overbought": "RSI above {rsi_overbought:g} and falling",
+    "price_below_sma": "Price below SMA 20 and falling",
+    "macd_bearish": "MACD crossed below signal line",
+    "volume_decline": "High volume on a down day",
+    "negative_momentum": "Down more than {momentum:.0%} in {momentum_days} days",
+}
+
+# Signal codes, in the category order of the `Signal` column
+SIGNAL_LABELS = ("HOLD", "BUY", "SELL")
+HOLD, BUY, SELL = range(len(SIGNAL_LABELS))
+
+# Number of set bits for every 6-bit side of the mask
+_POPCOUNT = np.array([bin(i).count("1") for i in range(1 << SELL_SHIFT)], dtype=np.uint8)
+
+@dataclass(frozen=True)
+class Strategy:
+    """
+    Declarative signal rules: thresholds, the enabled conditions and how many
+    of them must agree. Instances are hashable, so they can key caches.
+    """
+    rsi_oversold: float = 35
+    rsi_overbought: float = 65
+    volume_ratio: float = 1.2
+    momentum: float = 0.02
+    momentum_days: int = 5
+    min_votes: int = 2
+    conditions: tuple = CONDITIONS
+
+    def __post_init__(self):
+        unknown = [name for name in self.conditions if name not in CONDITIONS]
+        if unknown:
+            raise ValueError(f"Unknown signal conditions: {unknown}")
+        if self.min_votes < 1:
+            raise ValueError(f"min_votes must be at least 1, got {self.min_votes}")
+        if self.momentum_days < 1:
+            raise ValueError(f"momentum_days must be at least 1, got {self.momentum_days}")
+        # Normalise order so equal rule sets share one compiled evaluator
+        object.__setattr__(self, "conditions", tuple(name for name in CONDITIONS if name in self.conditions))
+
+    def replace(self, **changes):
+        return Strategy(**{**{f.name: getattr(self, f.name) for f in fields(self)}, **changes})
+
+DEFAULT_STRATEGY = Strategy()
+
+def _after(now, before, periods=1):
+    """now[i] & before[i - periods]; false for the first `periods` bars"""
+    out = np.zeros(now.shape, dtype=bool)
+    np.logical_and(now[periods:], before[:len(before) - periods], out=out[periods:])
+    return out
+
+class SignalInputs:
+    """
+    Threshold-free arrays the rules compare against, derived once per
+    indicator frame: crossovers, bar-over-bar direction and the volume ratio.
+    Previous-bar values are read through offset views rather than shifted
+    copies; comparisons against missing values (warm-up bars) are false.
+    """
+
+    # Arrays that make up the inputs, e.g. to place them in shared memory
+    FIELDS = ("close", "sma_20", "rsi", "rising", "falling", "rsi_rising", "rsi_falling",
+              "sma_cross_up", "sma_cross_down", "macd_cross_up", "macd_cross_down", "volume_ratio")
+
+    def __init__(self, df: pd.DataFrame):
+        volume = df["Volume"].to_numpy(dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            volume_ratio = volume / rolling_mean(volume, 20)
+        has_macd = "MACD" in df.columns
+        self._build(
+            df["Close"].to_numpy(dtype=np.float64),
+            df["SMA_20"].to_numpy(dtype=np.float64),
+            df["SMA_50"].to_numpy(dtype=np.float64),
+            df["RSI"].to_numpy(dtype=np.float64),
+            volume_ratio,
+            df["MACD"].to_numpy(dtype=np.float64) if has_macd else None,
+            df["Signal_Line"].to_numpy(dtype=np.float64) if has_macd else None,
+        )
+
+    @classmethod
+    def from_columns(cls, close, sma_20, sma_50, rsi, volume_ratio, macd=None, signal_line=None):
+        """
+        Inputs from indicator arrays. Arrays may also be (bars x symbols)
+        panels, which evaluates the rules for every symbol at once.
+        """
+        obj = cls.__new__(cls)
+        obj._build(close, sma_20, sma_50, rsi, volume_ratio, macd, signal_line)
+        return obj
+
+    def _build(self, close, sma_20, sma_50, rsi, volume_ratio, macd, signal_line):
+        self.close, self.sma_20, self.rsi, self.volume_ratio = close, sma_20, rsi, volume_ratio
+
+        self.rising, self.falling, self.rsi_rising, self.rsi_falling = np.zeros((4,) + close.shape, dtype=bool)
+        np.greater(close[1:], close[:-1], out=self.rising[1:])
+        np.less(close[1:], close[:-1], out=self.falling[1:])
+        np.greater(rsi[1:], rsi[:-1], out=self.rsi_rising[1:])
+        np.less(rsi[1:], rsi[:-1], out=self.rsi_falling[1:])
+        self.sma_cross_up = _after(sma_20 > sma_50, sma_20 <= sma_50)
+        self.sma_cross_down = _after(sma_20 < sma_50, sma_20 >= sma_50)
+
+        self.macd_cross_up = self.macd_cross_down = None
+        if macd is not None:
+            self.macd_cross_up = _after(macd > signal_line, macd <= signal_line)
+            self.macd_cross_down = _after(macd < signal_line, macd >= signal_line)
+        self._changes = {}
+        self._parent = None
+
+    def arrays(self):
+        """{field: array} for every field that is present"""
+        return {name: getattr(self, name) for name in self.FIELDS if getattr(self, name) is not None}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild inputs from `arrays()` output (views are used as-is, not copied)"""
+        obj = cls.__new__(cls)
+        for name in cls.FIELDS:
+            setattr(obj, name, arrays.get(name))
+        obj._changes = {}
+        obj._parent = None
+        return obj
+
+    def window(self, start, end):
+        """
+        Inputs restricted to bars [start, end) as views. Values still come from
+        the full history, so the window needs no warm-up of its own.
+        """
+        obj = SignalInputs.from_arrays({name: values[start:end] for name, values in self.arrays().items()})
+        obj._parent = (self, start, end)
+        return obj
+
+    def __len__(self):
+        return len(self.close)
+
+    def change(self, days):
+        """Fractional close-to-close change over `days` bars (NaN for the first ones)"""
+        if self._parent is not None:
+            parent, start, end = self._parent
+            return parent.change(days)[start:end]
+        if days not in self._changes:
+            out = np.full(self.close.shape, np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.divide(self.close[days:], self.close[:len(self.close) - days], out=out[days:])
+            out -= 1
+            self._changes[days] = out
+        return self._changes[days]
+
+# condition -> fn(inputs, strategy) returning a boolean array, or None when
+# the inputs lack what the rule reads
+_RULES = {
+    "sma_crossover": lambda x, s: x.sma_cross_up,
+    "rsi_oversold": lambda x, s: (x.rsi < s.rsi_oversold) & x.rsi_rising,
+    "price_above_sma": lambda x, s: (x.close > x.sma_20) & x.rising,
+    "macd_bullish": lambda x, s: x.macd_cross_up,
+    "volume_confirmation": lambda x, s: x.volume_ratio > s.volume_ratio,
+    "positive_momentum": lambda x, s: x.change(s.momentum_days) > s.momentum,
+    "sma_crossunder": lambda x, s: x.sma_cross_down,
+    "rsi_overbought": lambda x, s: (x.rsi > s.rsi_overbought) & x.rsi_falling,
+    "price_below_sma": lambda x, s: (x.close < x.sma_20) & x.falling,
+    "macd_bearish": lambda x, s: x.macd_cross_down,
+    "volume_decline": lambda x, s: (x.volume_ratio > s.volume_ratio) & x.falling,
+    "negative_momentum": lambda x, s: x.change(s.momentum_days) < -s.momentum,
+}
+
+class CompiledStrategy:
+    """A `Strategy` resolved into (bit, rule) pairs plus its vote threshold"""
+
+    def __init__(self, strategy: Strategy):
+        self.strategy = strategy
+        self.rules = tuple((CONDITIONS.index(name), _RULES[name]) for name in strategy.conditions)
+        self.min_votes = strategy.min_votes
+
+    def mask(self, inputs: SignalInputs):
+        """uint16 array with one bit per enabled rule that fired on each bar"""
+        mask = np.zeros(inputs.close.shape, dtype=np.uint16)
+        bits = np.empty(inputs.close.shape, dtype=np.uint16)
+        for bit, rule in self.rules:
+            fired = rule(inputs, self.strategy)
+            if fired is not None:
+                np.left_shift(fired, bit, out=bits, dtype=np.uint16)
+                mask |= bits
+        return mask
+
+    def codes(self, mask):
+        """int8 HOLD/BUY/SELL codes; BUY wins when both sides reach the vote count"""
+        buy_score, sell_score = signal_scores(mask)
+        codes = np.where(sell_score >= self.min_votes, SELL, HOLD).astype(np.int8)
+        codes[buy_score >= self.min_votes] = BUY
+        return codes
+
+@lru_cache(maxsize=64)
+def compile_strategy(strategy=DEFAULT_STRATEGY):
+    return CompiledStrategy(strategy)
+
+def signal_scores(mask):
+    """(buy_score, sell_score): number of buy and sell rules set in each mask"""
+    mask = np.asarray(mask, dtype=np.uint16)
+    return _POPCOUNT[mask & SIDE_BITS], _POPCOUNT[(mask >> SELL_SHIFT) & SIDE_BITS]
+
+def explain(mask, strategy=DEFAULT_STRATEGY):
+    """Labels of the rules set in one bar's mask, buy rules first"""
+    mask = int(mask)
+    params = {f.name: getattr(strategy, f.name) for f in fields(strategy)}
+    return [CONDITION_LABELS[name].format(**params) for bit, name in enumerate(CONDITIONS) if mask >> bit & 1]
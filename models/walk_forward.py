@@ -0,0 +1,153 @@
+# models/walk_forward.py
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from config import CACHE_DIR
+from models.backtest import TRADING_DAYS, simulate, summarize_returns
+from models.optimizer import SCORE_METRICS, evaluate_params, grid_params, prepare_inputs
+from models.strategy import DEFAULT_STRATEGY, compile_strategy
+
+@dataclass
+class WalkForwardResult:
+    """Per-fold table plus the stitched out-of-sample returns and their stats"""
+    folds: pd.DataFrame
+    returns: pd.Series
+    stats: dict
+
+def walk_forward_folds(n_bars, train_bars=504, test_bars=63, step=None):
+    """
+    (train_start, test_start, test_end) bar positions of every complete fold.
+    Folds are anchored at the first bar, so appending history only adds folds
+    at the end and leaves the earlier ones unchanged.
+    """
+    step = step or test_bars
+    if step < test_bars:
+        # Overlapping test windows would trade the same bars twice in the stitched returns
+        raise ValueError(f"step ({step}) must be at least test_bars ({test_bars})")
+    return [(start, start + train_bars, start + train_bars + test_bars)
+            for start in range(0, n_bars - train_bars - test_bars + 1, step)]
+
+class FoldCache:
+    """
+    Fold results keyed by a fingerprint of the fold's input arrays and the
+    search settings. In memory by default; with `cache_dir`, each fold is also
+    kept as one JSON file so later runs skip folds they have already seen.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None and self.cache_dir is not None:
+            try:
+                with open(self._path(key)) as f:
+                    entry = self.entries[key] = json.load(f)
+            except (OSError, ValueError):
+                entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+
+def default_fold_cache():
+    """Fold cache persisted next to the OHLCV cache"""
+    return FoldCache(os.path.join(CACHE_DIR, "walk_forward"))
+
+def _fold_key(inputs, start, end, settings):
+    digest = hashlib.sha1(settings.encode())
+    for name, values in sorted(inputs.arrays().items()):
+        digest.update(name.encode())
+        digest.update(np.ascontiguousarray(values[start:end]).tobytes())
+    return digest.hexdigest()
+
+def _fold_years(index, start, end):
+    if isinstance(index, pd.DatetimeIndex) and end - start > 1:
+        return (index[end - 1] - index[start]).days / 365.25
+    return (end - start) / TRADING_DAYS
+
+def walk_forward(df, params=None, train_bars=504, test_bars=63, step=None, base=DEFAULT_STRATEGY,
+                 metric="sharpe", mode="long_only", commission=0.0, slippage=0.0, rsi_method="sma",
+                 cache=None):
+    """
+    Walk-forward validation of the strategy thresholds on one OHLCV frame.
+
+    Each fold picks the best of `params` (dicts of `Strategy` fields; the
+    default grid if omitted) on its train window by `metric`, then trades the
+    following test window with it. Indicators are computed once over the full
+    history and windows are views into them. Fold results are looked up in
+    `cache` (a `FoldCache`; the on-disk `default_fold_cache()` if omitted) by
+    a fingerprint of the window data and settings, so extending the history
+    only evaluates the new folds.
+    """
+    if metric not in SCORE_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {SCORE_METRICS}")
+    params = grid_params() if params is None else list(params)
+    if not params:
+        raise ValueError("walk_forward needs at least one parameter combination")
+    cache = cache if cache is not None else default_fold_cache()
+    inputs = prepare_inputs({"_": df}, rsi_method)[0]["_"]
+    options = {"base": base, "metric": metric, "mode": mode, "commission": commission, "slippage": slippage}
+    settings = json.dumps([params, repr(base), rsi_method, train_bars, test_bars,
+                           sorted((k, repr(v)) for k, v in options.items())], default=str)
+
+    rows, oos_returns, oos_index = [], [], []
+    for train_start, test_start, test_end in walk_forward_folds(len(df), train_bars, test_bars, step):
+        key = _fold_key(inputs, train_start, test_end, settings)
+        entry = cache.get(key)
+        cached = entry is not None
+        if entry is None:
+            train = {"_": inputs.window(train_start, test_start)}
+            years = {"_": _fold_years(df.index, train_start, test_start)}
+            results = [evaluate_params(combo, train, years, **options) for combo in params]
+            scores = np.array([row["score"] for row in results], dtype=np.float64)
+            best = int(np.nanargmax(scores)) if not np.isnan(scores).all() else 0
+
+            test = inputs.window(test_start, test_end)
+            compiled = compile_strategy(base.replace(**params[best]))
+            returns = simulate(test.close, compiled.codes(compiled.mask(test)), mode, commission + slippage)[3]
+            entry = {
+                "params": params[best],
+                "train_score": results[best]["score"],
+                "test": summarize_returns(returns, _fold_years(df.index, test_start, test_end)),
+                "returns": returns.tolist(),
+            }
+            cache.put(key, entry)
+
+        rows.append({
+            "train_start": df.index[train_start],
+            "test_start": df.index[test_start],
+            "test_end": df.index[test_end - 1],
+            **entry["params"],
+            "train_score": entry["train_score"],
+            **{f"test_{name}": value for name, value in entry["test"].items()},
+            "cached": cached,
+        })
+        oos_returns.append(entry["returns"])
+        oos_index.append(df.index[test_start:test_end])
+
+    returns = pd.Series(np.concatenate(oos_returns) if oos_returns else np.zeros(0),
+                        index=oos_index[0].append(oos_index[1:]) if oos_index else df.index[:0],
+                        name="Return")
+    years = _fold_years(returns.index, 0, len(returns)) if len(returns) else 0.0
+    return WalkForwardResult(folds=pd.DataFrame(rows), returns=returns,
+                             stats=summarize_returns(returns.to_numpy(), years))
@@ -1,52 +1,231 @@
 # services/alphavantage_api.py
+import bisect
+import threading
+import numpy as np
 import requests
 import pandas as pd
-from config import ALPHAVANTAGE_API_KEY, REQUEST_TIMEOUT
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import ALPHAVANTAGE_API_KEY, API_BASE_URL, API_CALLS_PER_DAY, API_CALLS_PER_MINUTE, REQUEST_TIMEOUT
+from services.cache import OHLCVCache
+from services.rate_limit import RateLimiter, RateLimitError
 
-BASE_URL = "https://www.alphavantage.co/query"
+BASE_URL = API_BASE_URL
 
-def fetch_daily_data(symbol="AAPL"):
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Bar sizes accepted by TIME_SERIES_INTRADAY
+INTRADAY_INTERVALS = ("1min", "5min", "15min", "30min", "60min")
+
+# Shared on-disk cache so reruns and repeated calls don't hit the API
+_cache = OHLCVCache()
+
+class AlphaVantageClient:
+    """
+    Reusable Alpha Vantage client over one keep-alive session.
+
+    Connection errors and 429/5xx responses are retried by the transport with
+    exponential backoff; an optional `limiter` gates every request.
+    """
+
+    def __init__(self, api_key=ALPHAVANTAGE_API_KEY, base_url=BASE_URL, timeout=REQUEST_TIMEOUT,
+                 retries=3, backoff_factor=0.5, pool_size=8, limiter=None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limiter = limiter
+
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def query(self, **params):
+        """Run one API call and return the decoded JSON payload"""
+        if self.api_key == "YOUR_API_KEY_HERE":
+            raise ValueError("Please set your Alpha Vantage API key in config.py or as an environment variable")
+
+        try:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            response = self.session.get(self.base_url, params={**params, "apikey": self.api_key},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Network error: {e}")
+        except ValueError as e:
+            raise Exception(f"JSON decode error: {e}")
+
+        # Check for API errors
+        if "Error Message" in data:
+            raise Exception(f"API Error: {data['Error Message']}")
+        if "Note" in data:
+            raise RateLimitError(f"API Rate Limit: {data['Note']}")
+        return data
+
+    def daily_series(self, symbol, outputsize="compact"):
+        """Request TIME_SERIES_DAILY and return the raw date -> bar mapping"""
+        data = self.query(function="TIME_SERIES_DAILY", symbol=symbol, outputsize=outputsize)
+        if "Time Series (Daily)" not in data:
+            raise Exception(f"Invalid data format: {data}")
+        return data["Time Series (Daily)"]
+
+    def intraday_series(self, symbol, interval="5min", outputsize="compact"):
+        """Request TIME_SERIES_INTRADAY and return the raw timestamp -> bar mapping"""
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Unknown interval {interval!r}, expected one of {INTRADAY_INTERVALS}")
+        data = self.query(function="TIME_SERIES_INTRADAY", symbol=symbol, interval=interval, outputsize=outputsize)
+        key = f"Time Series ({interval})"
+        if key not in data:
+            raise Exception(f"Invalid data format: {data}")
+        return data[key]
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_default_client = None
+_default_limiter = None
+_default_client_lock = threading.Lock()
+
+def get_rate_limiter():
+    """The account's request budget, shared by every client in this process"""
+    global _default_limiter
+    with _default_client_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(API_CALLS_PER_MINUTE, API_CALLS_PER_DAY)
+        return _default_limiter
+
+def get_client():
+    """Process-wide client shared by every fetch that doesn't bring its own"""
+    global _default_client
+    limiter = get_rate_limiter()
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = AlphaVantageClient(limiter=limiter)
+        return _default_client
+
+def fetch_daily_data(symbol="AAPL", outputsize="compact", use_cache=True, incremental=True, client=None):
+    """
+    Fetch daily stock data, served from the local cache while it is still fresh.
+
+    With `incremental`, a stale stored history is brought up to date from the
+    compact window only; the full series is downloaded when nothing is stored
+    yet or the stored history ends before the compact window starts.
+    """
+    client = client or get_client()
+    if not use_cache:
+        return _download_daily_data(symbol, outputsize, client)
+
+    cached = _cache.get(symbol, outputsize)
+    if cached is not None:
+        return cached
+
+    stored = _cache.load(symbol, outputsize)[0] if incremental else None
+    df = update_daily_history(symbol, stored, client) if stored is not None and not stored.empty else None
+    if df is None:
+        df = _download_daily_data(symbol, outputsize, client)
+    _cache.put(symbol, outputsize, df)
+    return df
+
+def update_daily_history(symbol, stored, client=None):
+    """
+    Append bars newer than `stored` using one compact request.
+
+    Only response entries dated on or after the last stored bar are parsed; that
+    bar is overwritten so a revised close replaces the provisional one. Returns
+    None when the compact window doesn't reach back to the stored history.
+    """
+    series = (client or get_client()).daily_series(symbol, "compact")
+    last_stored = stored.index[-1]
+    if min(series) > last_stored.strftime("%Y-%m-%d"):
+        return None
+
+    new_bars = parse_daily_series(series, since=last_stored)
+    if new_bars.empty:
+        return stored
+    return pd.concat([stored.loc[stored.index < new_bars.index[0]], new_bars])
+
+def fetch_intraday_data(symbol="AAPL", interval="5min", after=None, client=None):
+    """
+    Intraday bars strictly after the timestamp `after` (all bars if None).
+
+    One compact request covers the latest 100 bars; when those don't reach
+    back to `after`, the full recent history is requested instead.
+    """
+    client = client or get_client()
+    series = client.intraday_series(symbol, interval, "compact")
+    if after is not None and series and min(series) > pd.Timestamp(after).strftime("%Y-%m-%d %H:%M:%S"):
+        series = client.intraday_series(symbol, interval, "full")
+    return parse_intraday_series(series, after=after)
+
+def cached_daily_data(symbol="AAPL", outputsize="compact"):
+    """
+    Return (df, metadata, is_fresh) from the local store without any network
+    access; df is None when nothing has been stored for the symbol yet.
+    """
+    return _cache.peek(symbol, outputsize)
+
+def invalidate_cache(symbol=None, outputsize=None):
+    """Force the next fetch for `symbol` (or every symbol) to go to the network"""
+    return _cache.invalidate(symbol, outputsize)
+
+def cache_stats():
+    """Hit/miss counters of the shared OHLCV cache"""
+    return _cache.stats()
+
+def _download_daily_data(symbol, outputsize="compact", client=None):
     """Fetch daily stock data from Alpha Vantage API"""
-    if ALPHAVANTAGE_API_KEY == "YOUR_API_KEY_HERE":
-        raise ValueError("Please set your Alpha Vantage API key in config.py or as an environment variable")
-    
-    url = f"{BASE_URL}?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={ALPHAVANTAGE_API_KEY}&outputsize=compact"
-    
+    series = (client or get_client()).daily_series(symbol, outputsize)
     try:
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Network error: {e}")
-    except ValueError as e:
-        raise Exception(f"JSON decode error: {e}")
-
-    # Check for API errors
-    if "Error Message" in data:
-        raise Exception(f"API Error: {data['Error Message']}")
-    if "Note" in data:
-        raise Exception(f"API Rate Limit: {data['Note']}")
-    if "Time Series (Daily)" not in data:
-        raise Exception(f"Invalid data format: {data}")
+        df = parse_daily_series(series)
 
-    try:
-        df = pd.DataFrame(data["Time Series (Daily)"]).T
-        df = df.rename(columns={
-            "1. open": "Open",
-            "2. high": "High",
-            "3. low": "Low",
-            "4. close": "Close",
-            "5. volume": "Volume"
-        }).astype(float)
-
-        df.index = pd.to_datetime(df.index)
-        df.sort_index(inplace=True)
-        
         # Check if we have enough data
         if len(df) < 50:
             raise Exception(f"Insufficient data: only {len(df)} days available")
-            
+
         return df
     except Exception as e:
         raise Exception(f"Data processing error: {e}")
+
+def parse_daily_series(series, since=None):
+    """
+    Build an OHLCV frame from the raw date -> bar mapping in a single pass,
+    writing straight into preallocated column arrays. Only dates >= `since`
+    are parsed.
+    """
+    dates = sorted(series)
+    if since is not None:
+        dates = dates[bisect.bisect_left(dates, pd.Timestamp(since).strftime("%Y-%m-%d")):]
+    return _parse_bars(series, dates)
+
+def parse_intraday_series(series, after=None):
+    """Like `parse_daily_series` for intraday bars, keeping only timestamps after `after`"""
+    stamps = sorted(series)
+    if after is not None:
+        stamps = stamps[bisect.bisect_right(stamps, pd.Timestamp(after).strftime("%Y-%m-%d %H:%M:%S")):]
+    return _parse_bars(series, stamps)
+
+def _parse_bars(series, dates):
+    """OHLCV frame of the `dates` keys of a raw series, written into preallocated column arrays"""
+    n = len(dates)
+    o, h, l, c, v = np.empty((len(OHLCV_COLUMNS), n), dtype=np.float64)
+    for i, date in enumerate(dates):
+        bar = series[date]
+        o[i] = float(bar["1. open"])
+        h[i] = float(bar["2. high"])
+        l[i] = float(bar["3. low"])
+        c[i] = float(bar["4. close"])
+        v[i] = float(bar["5. volume"])
+
+    index = pd.DatetimeIndex(np.array(dates, dtype="datetime64[ns]"))
+    return pd.DataFrame(dict(zip(OHLCV_COLUMNS, (o, h, l, c, v))), index=index, copy=False)
@@ -0,0 +1,51 @@
+# services/background.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class BackgroundRefresher:
+    """
+    Runs refresh jobs on a small worker pool, at most one per key at a time.
+
+    A failed job is not resubmitted until `retry_after` seconds have passed, so
+    a page that reruns while the API is down doesn't hammer it.
+    """
+
+    def __init__(self, max_workers=2, retry_after=60.0):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._jobs = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+        self.retry_after = retry_after
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Start `fn` for `key` unless it is already running or recently failed"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.done():
+                return job
+            failed_at = self._errors.get(key, (None, 0.0))[1]
+            if time.monotonic() - failed_at < self.retry_after:
+                return None
+            job = self._pool.submit(fn, *args, **kwargs)
+            job.add_done_callback(lambda f, key=key: self._finished(key, f))
+            self._jobs[key] = job
+            return job
+
+    def _finished(self, key, future):
+        error = future.exception()
+        with self._lock:
+            if error is None:
+                self._errors.pop(key, None)
+            else:
+                self._errors[key] = (error, time.monotonic())
+
+    def is_running(self, key):
+        with self._lock:
+            job = self._jobs.get(key)
+            return job is not None and not job.done()
+
+    def last_error(self, key):
+        """Exception raised by the most recent failed run for `key`, if any"""
+        with self._lock:
+            return self._errors.get(key, (None, 0.0))[0]
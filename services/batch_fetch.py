@@ -0,0 +1,55 @@
+# services/batch_fetch.py
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from services.alphavantage_api import BASE_URL, AlphaVantageClient, RateLimitError, fetch_daily_data, get_rate_limiter
+from services.rate_limit import BudgetExhaustedError
+
+def fetch_many(symbols, outputsize="compact", max_workers=4, base_url=BASE_URL,
+               limiter=None, client=None, max_retries=5, backoff=15.0, use_cache=True):
+    """
+    Fetch several symbols concurrently and yield `(symbol, df, error)` as each
+    one completes.
+
+    Requests share one pooled client. Its token-bucket `limiter` defaults to
+    the process-wide account budget (`get_rate_limiter`), so concurrent batches
+    and dashboard fetches draw on the same per-minute and per-day allowance.
+    A rate-limit `Note` drains the per-minute bucket and the symbol is retried
+    with exponential backoff; other failures are yielded as `error` with `df`
+    set to None.
+    """
+    owns_client = client is None
+    if owns_client:
+        limiter = limiter or get_rate_limiter()
+        client = AlphaVantageClient(base_url=base_url, pool_size=max_workers, limiter=limiter)
+
+    def fetch_one(symbol):
+        for attempt in range(max_retries + 1):
+            try:
+                return fetch_daily_data(symbol, outputsize, use_cache=use_cache, client=client)
+            except BudgetExhaustedError:
+                # Backing off can't help until the budget refills
+                raise
+            except RateLimitError:
+                if attempt == max_retries:
+                    raise
+                if client.limiter is not None:
+                    client.limiter.penalize()
+                time.sleep(backoff * 2 ** attempt)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(fetch_one, symbol): symbol for symbol in dict.fromkeys(symbols)}
+            try:
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        yield symbol, future.result(), None
+                    except Exception as e:
+                        yield symbol, None, e
+            finally:
+                # A caller that stops early shouldn't wait for the queued symbols
+                for future in futures:
+                    future.cancel()
+    finally:
+        if owns_client:
+            client.close()
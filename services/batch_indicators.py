@@ -0,0 +1,173 @@
+# services/batch_indicators.py
+import numpy as np
+import pandas as pd
+from services.indicators import RSI_METHODS
+
+def rolling_mean_2d(values, window):
+    """
+    Column-wise rolling mean of a (bars x symbols) array using cumulative sums.
+    A window containing NaN yields NaN, as with pandas' `rolling(window).mean()`.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+
+    valid = ~np.isnan(values)
+    has_gaps = not valid.all()
+    # Centre each column before summing to keep cancellation error small
+    offset = np.nanmean(values, axis=0) if has_gaps else values.mean(axis=0)
+    offset = np.nan_to_num(offset)
+    sums = np.cumsum(np.where(valid, values - offset, 0.0) if has_gaps else values - offset, axis=0)
+
+    window_sums = sums[window - 1:].copy()
+    window_sums[1:] -= sums[:-window]
+    out[window - 1:] = window_sums / window + offset
+    if has_gaps:
+        counts = np.cumsum(valid, axis=0)
+        window_counts = counts[window - 1:].copy()
+        window_counts[1:] -= counts[:-window]
+        out[window - 1:][window_counts < window] = np.nan
+    return out
+
+def ewm_mean_2d(values, span, adjust=True):
+    """
+    Column-wise exponentially weighted mean, one recursive pass over the bars
+    vectorised across symbols. Uses the same recurrence (and NaN handling) as
+    pandas' `ewm(span=span, adjust=adjust).mean()`.
+    """
+    com = (span - 1) / 2.0
+    alpha = 1.0 / (1.0 + com)
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+
+    out = np.empty(values.shape)
+    if len(values) == 0:
+        return out
+    out[0] = values[0]
+
+    if not np.isnan(values).any():
+        # Gap-free panels share one weight sequence, so each step is a single
+        # fused update of the whole row
+        old_wt = 1.0
+        weighted = out[0].copy()
+        for i in range(1, len(values)):
+            old_wt *= old_wt_factor
+            total = old_wt + new_wt
+            weighted *= old_wt / total
+            weighted += values[i] * (new_wt / total)
+            out[i] = weighted
+            old_wt = total if adjust else 1.0
+        return out
+
+    weighted = out[0].copy()
+    old_wt = np.ones(values.shape[1])
+    for i in range(1, len(values)):
+        cur = values[i]
+        observed = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * old_wt_factor, old_wt)
+        update = started & observed & (weighted != cur)
+        blended = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(update, blended, weighted)
+        step = started & observed
+        old_wt = np.where(step, old_wt + new_wt if adjust else 1.0, old_wt)
+        weighted = np.where(~started & observed, cur, weighted)
+        out[i] = weighted
+    return out
+
+def wilder_mean_2d(values, period):
+    """
+    Column-wise Wilder smoothing with the conventions of `_wilder_average`,
+    each column starting at its first non-NaN row: that value is skipped, the
+    next `period` seed a simple mean, then avg += (x - avg) / period. Later
+    missing values count as 0. One recursive pass over the bars, vectorised
+    across symbols.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) == 0:
+        return out
+    observed = ~np.isnan(values)
+    first = np.where(observed.any(axis=0), observed.argmax(axis=0), len(values))
+    seeded = first + period
+    values = np.nan_to_num(values)
+    # Rows above `first` are all padding, so the running total at `seeded`
+    # is exactly the sum of the seed window
+    totals = np.cumsum(values, axis=0)
+    seed = totals[np.minimum(seeded, len(values) - 1), np.arange(values.shape[1])] / period
+
+    avg = np.full(values.shape[1], np.nan)
+    for i in range(len(values)):
+        avg = np.where(seeded == i, seed, avg + (values[i] - avg) / period)
+        out[i] = avg
+    return out
+
+def rsi_2d(close, period=14, method="sma"):
+    """Column-wise RSI with the same conventions (and methods) as `calculate_rsi`"""
+    if method not in RSI_METHODS:
+        raise ValueError(f"Unknown RSI method {method!r}, expected one of {RSI_METHODS}")
+    delta = np.empty(close.shape)
+    delta[0] = np.nan
+    delta[1:] = close[1:] - close[:-1]
+    # A symbol's first bar counts as no move, but bars before it stay missing
+    missing = np.isnan(close)
+    gain = np.where(missing, np.nan, np.where(delta > 0, delta, 0.0))
+    loss = np.where(missing, np.nan, -np.where(delta < 0, delta, 0.0))
+    if method == "wilder":
+        avg_gain = wilder_mean_2d(gain, period)
+        avg_loss = wilder_mean_2d(loss, period)
+    else:
+        # Means of non-negative values; clamp the cumulative-sum rounding below zero
+        avg_gain = np.maximum(rolling_mean_2d(gain, period), 0.0)
+        avg_loss = np.maximum(rolling_mean_2d(loss, period), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    # A completely flat window is neutral rather than undefined
+    rsi[(avg_gain == 0) & (avg_loss == 0)] = 50.0
+    return rsi
+
+def compute_indicator_panel(close, volume=None, rsi_method="sma"):
+    """
+    Compute every indicator of `add_indicators` for a (bars x symbols) close
+    matrix in one vectorised pass. Returns a dict of equally shaped arrays;
+    `Volume_Ratio` (volume over its 20-bar mean) is added when `volume` is given.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    ema_fast = ewm_mean_2d(close, 12, adjust=False)
+    ema_slow = ewm_mean_2d(close, 26, adjust=False)
+    macd = ema_fast - ema_slow
+    signal_line = ewm_mean_2d(macd, 9, adjust=False)
+
+    panel = {
+        "Close": close,
+        "SMA_20": rolling_mean_2d(close, 20),
+        "SMA_50": rolling_mean_2d(close, 50),
+        "EMA_20": ewm_mean_2d(close, 20, adjust=False),
+        "RSI": rsi_2d(close, 14, rsi_method),
+        "MACD": macd,
+        "Signal_Line": signal_line,
+        "MACD_Histogram": macd - signal_line,
+    }
+    if volume is not None:
+        volume = np.asarray(volume, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            panel["Volume_Ratio"] = volume / rolling_mean_2d(volume, 20)
+    return panel
+
+def build_panel(frames, column="Close"):
+    """Align one column of several per-symbol frames into a (dates x symbols) DataFrame"""
+    return pd.concat({symbol: df[column] for symbol, df in frames.items()}, axis=1).sort_index()
+
+def batch_add_indicators(close: pd.DataFrame, volume: pd.DataFrame = None, rsi_method="sma"):
+    """
+    Indicators for many symbols at once from a (dates x symbols) close frame.
+
+    Returns a stacked frame indexed by (Date, Symbol) with one column per
+    indicator; padding rows where a symbol has no close are dropped.
+    """
+    if volume is not None:
+        volume = volume.reindex(index=close.index, columns=close.columns)
+    panel = compute_indicator_panel(close.to_numpy(), None if volume is None else volume.to_numpy(), rsi_method)
+
+    index = pd.MultiIndex.from_product([close.index, close.columns], names=["Date", "Symbol"])
+    stacked = pd.DataFrame({name: values.ravel() for name, values in panel.items()}, index=index)
+    return stacked[~np.isnan(panel["Close"].ravel())]
@@ -0,0 +1,120 @@
+# services/cache.py
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from config import CACHE_DIR
+from services.column_store import read_columns, remove_columns, write_columns
+from services.market_calendar import last_completed_trading_day, last_market_close
+
+# Data files of the earlier Parquet cache: never read (the series is simply
+# refetched into the column store) and removed by `invalidate`
+LEGACY_EXTENSIONS = (".parquet",)
+
+class OHLCVCache:
+    """On-disk columnar cache of parsed daily OHLCV frames keyed by symbol and outputsize"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, symbol, outputsize):
+        key = f"{symbol.upper()}_{outputsize}"
+        base = os.path.join(self.cache_dir, key)
+        return base + ".cols", base + ".json"
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_fresh(self, df, meta, now=None):
+        """
+        A stored series is fresh when it already contains the last completed
+        trading day, or when it was fetched after that session closed (holidays
+        and late publication would otherwise trigger a refetch on every call).
+        """
+        if df is None or df.empty:
+            return False
+        if df.index[-1] >= last_completed_trading_day(now):
+            return True
+        fetched_at = meta.get("fetched_at")
+        if fetched_at is None:
+            return False
+        return datetime.fromisoformat(fetched_at) >= last_market_close(now)
+
+    def load(self, symbol, outputsize="compact"):
+        """Return the stored frame and its metadata, or (None, {}) if absent"""
+        data_path, meta_path = self._paths(symbol, outputsize)
+        if not os.path.isdir(data_path):
+            return None, {}
+        try:
+            df = read_columns(data_path)
+        except (OSError, ValueError):
+            return None, {}
+        return df, self._read_meta(meta_path)
+
+    def peek(self, symbol, outputsize="compact", now=None):
+        """Return (frame, metadata, is_fresh) for whatever is stored, without counting a hit or miss"""
+        df, meta = self.load(symbol, outputsize)
+        return df, meta, self.is_fresh(df, meta, now)
+
+    def get(self, symbol, outputsize="compact", now=None):
+        """Return a fresh cached frame (counted as a hit) or None (counted as a miss)"""
+        df, _, fresh = self.peek(symbol, outputsize, now)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return df if fresh else None
+
+    def put(self, symbol, outputsize, df, fetched_at=None):
+        """Persist a parsed frame atomically alongside its fetch timestamp"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(symbol, outputsize)
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        meta = {"symbol": symbol.upper(), "outputsize": outputsize,
+                "fetched_at": fetched_at.isoformat(), "rows": len(df)}
+        write_columns(data_path, df)
+        tmp_path = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def invalidate(self, symbol=None, outputsize=None):
+        """Drop cached entries for one symbol (optionally one outputsize) or everything"""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        prefix = f"{symbol.upper()}_" if symbol else ""
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            stem, ext = os.path.splitext(name)
+            if ext not in (".cols", ".json", *LEGACY_EXTENSIONS) or not stem.startswith(prefix):
+                continue
+            if outputsize and not stem.endswith(f"_{outputsize}"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if ext == ".cols":
+                remove_columns(path)
+                removed += 1
+            else:
+                os.remove(path)
+                removed += ext in LEGACY_EXTENSIONS
+        return removed
+
+    def stats(self):
+        """Hit/miss counters since this cache object was created"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / total if total else 0.0}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,53 @@
+# services/column_store.py
+import os
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+
+# On-disk dtype of each OHLCV column
+COLUMN_DTYPES = {
+    "Open": np.float64,
+    "High": np.float64,
+    "Low": np.float64,
+    "Close": np.float64,
+    "Volume": np.int64,
+}
+INDEX_FILE = "index.npy"
+
+def write_columns(path, df: pd.DataFrame):
+    """
+    Write an OHLCV frame as one .npy file per column plus a datetime64 index.
+
+    The new directory is built next to `path` and swapped in with renames, so a
+    concurrent reader sees either the old or the new series, never a mix.
+    """
+    token = f"{os.getpid()}.{threading.get_ident()}"
+    tmp_path = f"{path}.{token}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    np.save(os.path.join(tmp_path, INDEX_FILE), df.index.values.astype("datetime64[ns]"))
+    for col, dtype in COLUMN_DTYPES.items():
+        np.save(os.path.join(tmp_path, f"{col}.npy"), df[col].to_numpy(dtype=dtype))
+
+    old_path = f"{path}.{token}.old"
+    if os.path.isdir(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+def read_columns(path, mmap=True):
+    """
+    Open a stored OHLCV frame. With `mmap` the columns are read-only memory
+    maps, so loading costs no parsing and only the pages that are touched.
+    """
+    mode = "r" if mmap else None
+    index = np.load(os.path.join(path, INDEX_FILE), mmap_mode=mode)
+    columns = {col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode=mode)
+               for col in COLUMN_DTYPES}
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(index), copy=False)
+
+def remove_columns(path):
+    """Delete a stored frame directory"""
+    shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,251 @@
+# services/compute.py
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pyarrow as pa
+from config import COMPUTE_WORKERS
+from models.backtest import BacktestResult, run_backtest
+from models.model import SIGNAL_INDICATORS
+from models.screener import SCREEN_BARS, screen_watchlist
+from models.strategy import DEFAULT_STRATEGY
+from services.alphavantage_api import OHLCV_COLUMNS, cached_daily_data
+from services.indicators import add_indicators
+from services.signal_store import read_history
+
+JOB_KINDS = ("indicators", "backtest", "screen")
+
+def to_ipc(df):
+    """DataFrame (index included) as an Arrow IPC stream buffer"""
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    # from_pandas turns NaN into nulls, which forces a copy when reading
+    # back; storing the float columns as-is keeps them zero-copy
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            table = table.set_column(i, field, pa.array(df[field.name].to_numpy(), type=field.type))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def from_ipc(buffer):
+    """
+    DataFrame from an Arrow IPC stream. Numeric columns without nulls are
+    views of the buffer rather than copies, so the frame is read-only.
+    """
+    return pa.ipc.open_stream(buffer).read_all().to_pandas(split_blocks=True)
+
+# --------------------------
+# Jobs (run in the worker processes)
+# --------------------------
+# Workers only read the local store: network fetches stay in the server
+# process, where every request draws on the one shared rate limiter
+# (`services.alphavantage_api.get_rate_limiter`).
+def indicator_frame(symbol, outputsize="compact", data_version=None, rsi_method="sma", columns=SIGNAL_INDICATORS):
+    """
+    Stored prices with indicators. The nightly job's output is reused when it
+    was built from `data_version`; otherwise whatever is stored now is used,
+    as on the dashboard's inline path (a refresh may have landed since the
+    caller read the version).
+    """
+    df, _ = read_history(symbol, outputsize, columns=[*OHLCV_COLUMNS, *columns],
+                         fetched_at=data_version, rsi_method=rsi_method)
+    if df is not None:
+        return df
+    df = cached_daily_data(symbol, outputsize)[0]
+    if df is None:
+        raise ValueError(f"No stored {outputsize} history for {symbol}")
+    return add_indicators(df, rsi_method=rsi_method, columns=columns)
+
+def _indicators_job(symbol, outputsize, data_version, rsi_method, columns):
+    return to_ipc(indicator_frame(symbol, outputsize, data_version, rsi_method, columns))
+
+def _backtest_job(buffer, mode, commission, slippage):
+    result = run_backtest(from_ipc(buffer), mode, commission=commission, slippage=slippage)
+    series = result.equity.to_frame().join([result.returns, result.positions])
+    return to_ipc(series), to_ipc(result.trades), result.stats
+
+def _screen_job(symbols, outputsize, strategy, bars, rsi_method):
+    return to_ipc(screen_watchlist(symbols, outputsize, strategy, bars, rsi_method))
+
+def _init_worker(started):
+    # Hold every worker until all of them exist, so the pool starts them all
+    # while it is being created and never spawns one later
+    started.wait(timeout=120)
+
+def _ready():
+    # Unpickling this job imports the module and its dependencies
+    return os.getpid()
+
+def _run_job(fn, args):
+    started = time.time()
+    payload = fn(*args)
+    return payload, started, time.time(), os.getpid()
+
+def _decode_backtest(payload):
+    series, trades, stats = payload
+    frame = from_ipc(series)
+    return BacktestResult(equity=frame["Equity"], returns=frame["Return"], positions=frame["Position"],
+                          trades=from_ipc(trades), stats=stats)
+
+# --------------------------
+# Service (server process)
+# --------------------------
+# Serialises pool creation, the only time `__main__` is swapped
+_spawn_lock = threading.Lock()
+
+@contextmanager
+def _bare_main():
+    """
+    Streamlit executes the page as `__main__`, and spawned processes re-run
+    the main module on start; hide it while a pool starts its workers.
+    """
+    with _spawn_lock:
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+class ComputeService:
+    """
+    Pool of worker processes that the dashboard hands its heavy work to, so
+    the server's script threads only wait on results and several cores are
+    used at once. Jobs return Arrow IPC buffers, decoded in the server
+    without copying the column data.
+
+    Each method returns a `Future` of the decoded result. Timings of the
+    most recent `history` jobs are kept for `stats`.
+    """
+
+    def __init__(self, max_workers=COMPUTE_WORKERS, history=256):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be positive, got {max_workers}")
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.jobs = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+
+    def _new_pool(self):
+        # Forking a server with running threads can copy held locks; spawned
+        # workers start clean and import only what the jobs need
+        context = multiprocessing.get_context("spawn")
+        started = context.Barrier(self.max_workers)
+        pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                   initializer=_init_worker, initargs=(started,))
+        # One job per worker starts them all now (each submit spawns a worker
+        # while none is idle, and none can be idle before the barrier opens),
+        # so later submits never start a process
+        with _bare_main():
+            for _ in range(self.max_workers):
+                pool.submit(_ready)
+        return pool
+
+    def _submit(self, kind, decode, fn, *args):
+        result = Future()
+        submitted = time.time()
+
+        def done(job):
+            finished = time.time()
+            record = {"kind": kind, "submitted": submitted, "total_ms": (finished - submitted) * 1e3,
+                      "queued_ms": np.nan, "run_ms": np.nan, "worker": None, "error": None}
+            try:
+                payload, started, ended, pid = job.result()
+                record.update(queued_ms=(started - submitted) * 1e3, run_ms=(ended - started) * 1e3, worker=pid)
+                value = decode(payload)
+            except BaseException as e:
+                record["error"] = str(e)
+                self._finish(record)
+                result.set_exception(e)
+                return
+            self._finish(record)
+            result.set_result(value)
+
+        with self._lock:
+            try:
+                job = self._pool.submit(_run_job, fn, args)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+                job = self._pool.submit(_run_job, fn, args)
+            self.in_flight += 1
+        job.add_done_callback(done)
+        return result
+
+    def _finish(self, record):
+        with self._lock:
+            self.in_flight -= 1
+            self.jobs.append(record)
+            if record["error"] is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def indicators(self, symbol, outputsize="compact", data_version=None, rsi_method="sma",
+                   columns=SIGNAL_INDICATORS):
+        """Future of `indicator_frame` computed in a worker"""
+        return self._submit("indicators", from_ipc, _indicators_job, symbol, outputsize, data_version,
+                            rsi_method, tuple(columns))
+
+    def backtest(self, df, mode="long_only", commission=0.0, slippage=0.0):
+        """Future of `run_backtest` over `df` (only Close and Signal are sent to the worker)"""
+        return self._submit("backtest", _decode_backtest, _backtest_job, to_ipc(df[["Close", "Signal"]]),
+                            mode, commission, slippage)
+
+    def screen(self, symbols, outputsize="compact", strategy=DEFAULT_STRATEGY, bars=SCREEN_BARS, rsi_method="sma"):
+        """Future of `screen_watchlist` computed in a worker"""
+        return self._submit("screen", from_ipc, _screen_job, list(symbols), outputsize, strategy, bars, rsi_method)
+
+    def stats(self):
+        """
+        Worker count, jobs in flight, `queue_depth` (jobs waiting for a free
+        worker) and per-kind mean/max queue and run times of recent jobs in ms
+        """
+        with self._lock:
+            jobs = list(self.jobs)
+            stats = {"workers": self.max_workers, "in_flight": self.in_flight,
+                     "queue_depth": max(0, self.in_flight - self.max_workers),
+                     "completed": self.completed, "failed": self.failed, "by_kind": {}}
+        for kind in JOB_KINDS:
+            timed = [job for job in jobs if job["kind"] == kind and job["error"] is None]
+            if not timed:
+                continue
+            queued = np.array([job["queued_ms"] for job in timed])
+            run = np.array([job["run_ms"] for job in timed])
+            stats["by_kind"][kind] = {"jobs": len(timed), "mean_queued_ms": float(queued.mean()),
+                                      "mean_run_ms": float(run.mean()), "max_run_ms": float(run.max()),
+                                      "last_run_ms": float(run[-1])}
+        return stats
+
+    def recent_jobs(self):
+        """Timing records of the most recent jobs, oldest first"""
+        with self._lock:
+            return list(self.jobs)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+def get_compute_service():
+    """The process-wide service, or None when COMPUTE_WORKERS is 0 (compute inline)"""
+    global _default_service
+    if COMPUTE_WORKERS < 1:
+        return None
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = ComputeService()
+        return _default_service
@@ -0,0 +1,131 @@
+# services/indicator_graph.py
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# op name -> fn(*input_arrays, **params) returning a float array
+_OPS = {}
+# output column -> builder(options) returning the Node that produces it
+_INDICATORS = {}
+# display group (e.g. "macd") -> output columns
+_GROUPS = {}
+
+def register_op(name):
+    """Decorator registering a numeric op usable in graph nodes"""
+    def decorator(fn):
+        _OPS[name] = fn
+        return fn
+    return decorator
+
+class Node:
+    """
+    One series in the indicator graph. Nodes built from the same op, inputs
+    and parameters share a key, so the planner computes them only once.
+    """
+
+    __slots__ = ("op", "inputs", "params", "key")
+
+    def __init__(self, op, *inputs, **params):
+        if op != "column" and op not in _OPS:
+            raise ValueError(f"Unknown indicator op {op!r}")
+        self.op = op
+        self.inputs = inputs
+        self.params = params
+        self.key = (op, tuple(node.key for node in inputs), tuple(sorted(params.items())))
+
+    def __repr__(self):
+        return f"Node{self.key!r}"
+
+def column(name):
+    """Source node reading one column of the input frame"""
+    return Node("column", name=name)
+
+def register_indicator(name, builder, group=None):
+    """
+    Expose an output column. `builder(options)` returns the Node computing it;
+    `options` carries plan-wide settings such as the RSI method.
+    """
+    _INDICATORS[name] = builder
+    if group is not None:
+        _GROUPS.setdefault(group, []).append(name)
+    _plan.cache_clear()
+
+def registered_indicators():
+    return tuple(_INDICATORS)
+
+def indicator_columns(*groups):
+    """Output columns belonging to the given display groups"""
+    return tuple(col for group in groups for col in _GROUPS.get(group, ()))
+
+class IndicatorPlan:
+    """Deduplicated, dependency-ordered nodes needed for a set of output columns"""
+
+    def __init__(self, columns, options):
+        unknown = [col for col in columns if col not in _INDICATORS]
+        if unknown:
+            raise ValueError(f"Unknown indicators: {unknown}")
+        self.outputs = {col: _INDICATORS[col](options) for col in columns}
+        self.steps = []
+        seen = set()
+
+        def visit(node):
+            if node.key in seen:
+                return
+            for dep in node.inputs:
+                visit(dep)
+            seen.add(node.key)
+            self.steps.append(node)
+
+        for node in self.outputs.values():
+            visit(node)
+
+    def execute(self, df: pd.DataFrame):
+        """Evaluate every step once and return {column: array}"""
+        values = {}
+        for node in self.steps:
+            if node.op == "column":
+                values[node.key] = df[node.params["name"]].to_numpy(dtype=np.float64)
+            else:
+                inputs = [values[dep.key] for dep in node.inputs]
+                values[node.key] = _OPS[node.op](*inputs, **node.params)
+        return {col: values[node.key] for col, node in self.outputs.items()}
+
+@lru_cache(maxsize=128)
+def _plan(columns, options):
+    return IndicatorPlan(columns, dict(options))
+
+def plan_indicators(columns, **options):
+    """Build (or reuse) the plan computing `columns` under the given options"""
+    return _plan(tuple(columns), tuple(sorted(options.items())))
+
+# --------------------------
+# Generic ops
+# --------------------------
+@register_op("rolling_mean")
+def _rolling_mean(x, window):
+    return pd.Series(x).rolling(window).mean().to_numpy()
+
+@register_op("rolling_std")
+def _rolling_std(x, window, ddof=0):
+    return pd.Series(x).rolling(window).std(ddof=ddof).to_numpy()
+
+@register_op("ewm_mean")
+def _ewm_mean(x, span=None, alpha=None, adjust=False):
+    return pd.Series(x).ewm(span=span, alpha=alpha, adjust=adjust).mean().to_numpy()
+
+@register_op("diff")
+def _diff(x):
+    out = np.empty(len(x))
+    if len(x):
+        out[0] = np.nan
+        np.subtract(x[1:], x[:-1], out=out[1:])
+    return out
+
+@register_op("sub")
+def _sub(a, b):
+    return a - b
+
+@register_op("add_scaled")
+def _add_scaled(a, b, scale=1.0):
+    """a + scale * b"""
+    return a + scale * b
@@ -1,38 +1,193 @@
 # services/indicators.py
 import pandas as pd
 import numpy as np
+from services.indicator_graph import (
+    Node, column, indicator_columns, plan_indicators, register_indicator, register_op,
+)
 
-def add_indicators(df: pd.DataFrame):
-    """Add SMA, EMA, RSI, MACD indicators to stock dataframe"""
-    # Simple Moving Averages
-    df["SMA_20"] = df["Close"].rolling(20).mean()
-    df["SMA_50"] = df["Close"].rolling(50).mean()
-    
-    # Exponential Moving Average
-    df["EMA_20"] = df["Close"].ewm(span=20, adjust=False).mean()
-    
-    # RSI calculation
-    df["RSI"] = calculate_rsi(df["Close"], 14)
-    
-    # MACD calculation
-    df["MACD"], df["Signal_Line"], df["MACD_Histogram"] = calculate_macd(df["Close"])
-    
+RSI_METHODS = ("sma", "wilder")
+
+# Columns produced by add_indicators when no explicit selection is given
+DEFAULT_INDICATORS = ("SMA_20", "SMA_50", "EMA_20", "RSI", "MACD", "Signal_Line", "MACD_Histogram")
+
+def add_indicators(df: pd.DataFrame, rsi_method="sma", columns=DEFAULT_INDICATORS):
+    """
+    Add indicator columns to stock dataframe (by default SMA, EMA, RSI, MACD).
+
+    Only the requested `columns` and the intermediates they depend on are
+    computed, and intermediates shared between indicators are computed once.
+    """
+    outputs = plan_indicators(columns, rsi_method=rsi_method).execute(df)
+    for name, values in outputs.items():
+        df[name] = values
     return df
 
-def calculate_rsi(prices, period=14):
-    """Calculate RSI (Relative Strength Index)"""
-    delta = prices.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
+def calculate_rsi(prices, period=14, method="sma"):
+    """
+    Calculate RSI (Relative Strength Index)
+
+    method="sma" averages gains and losses over a simple rolling window
+    (Cutler's RSI); method="wilder" uses Wilder's smoothing, seeded with the
+    simple mean of the first `period` moves. A window without losses reads 100,
+    and a completely flat window reads 50.
+    """
+    values = np.asarray(prices, dtype=np.float64)
+    rsi = rsi_kernel(values, period, method)
+    if isinstance(prices, pd.Series):
+        return pd.Series(rsi, index=prices.index, name=prices.name)
+    return rsi
+
+def rsi_kernel(values, period=14, method="sma"):
+    """RSI of a 1-D float array computed on numpy buffers only"""
+    delta = np.empty(len(values))
+    if len(values):
+        delta[0] = np.nan
+        np.subtract(values[1:], values[:-1], out=delta[1:])
+    return rsi_from_delta(delta, period, method)
+
+def rsi_from_delta(delta, period=14, method="sma"):
+    """RSI from bar-to-bar price changes; a missing (NaN) change counts as no move"""
+    if method not in RSI_METHODS:
+        raise ValueError(f"Unknown RSI method {method!r}, expected one of {RSI_METHODS}")
+
+    gain = np.fmax(delta, 0.0)
+    loss = np.fmax(-delta, 0.0)
+    if method == "wilder":
+        avg_gain = _wilder_average(gain, period)
+        avg_loss = _wilder_average(loss, period)
+    else:
+        avg_gain = rolling_mean(gain, period)
+        avg_loss = rolling_mean(loss, period)
+    return _rsi_from_averages(avg_gain, avg_loss)
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    # No losses in the window: fully overbought, or neutral if nothing moved at all
+    no_loss = avg_loss == 0
+    rsi[no_loss] = np.where(avg_gain[no_loss] > 0, 100.0, 50.0)
     return rsi
 
+def rolling_mean(values, window):
+    """Trailing mean as a sum of shifted slices (no running sum to drift on long series)"""
+    out = np.full(len(values), np.nan)
+    n = len(values) - window + 1
+    if n <= 0:
+        return out
+    sums = out[window - 1:]
+    sums[:] = values[:n]
+    for k in range(1, window):
+        sums += values[k:k + n]
+    sums /= window
+    return out
+
+def _wilder_average(values, period):
+    """
+    Wilder's smoothing of values[1:]: the first output (at index `period`) is
+    the simple mean of the first `period` values, then avg += (x - avg) / period.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) <= period:
+        return out
+    seed = values[1:period + 1].mean()
+    out[period:] = linear_recurrence(values[period + 1:] / period, (period - 1) / period, seed)
+    return out
+
+def linear_recurrence(x, decay, init, block=256):
+    """
+    Solve y[0] = init, y[i] = decay * y[i-1] + x[i-1] for a whole array.
+
+    The series is cut into blocks; inside each block the recurrence is a
+    scaled cumulative sum, and only one scalar carry per block is propagated
+    sequentially, so the work stays in numpy even for millions of values.
+    """
+    n = len(x)
+    y = np.empty(n + 1)
+    y[0] = init
+    if n == 0:
+        return y
+    if decay == 0:
+        y[1:] = x
+        return y
+
+    # Keep decay ** -block comfortably inside float64 range
+    block = int(max(1, min(block, 300 / -np.log10(decay))))
+    n_blocks = -(-n // block)
+    padded = np.zeros(n_blocks * block)
+    padded[:n] = x
+    steps = np.arange(block)
+    local = np.cumsum(padded.reshape(n_blocks, block) * decay ** -steps, axis=1)
+    local *= decay ** steps
+
+    carry = np.empty(n_blocks)
+    carried = init
+    decay_block = decay ** block
+    for b, block_end in enumerate(local[:, -1]):
+        carry[b] = carried
+        carried = decay_block * carried + block_end
+    local += carry[:, None] * decay ** (steps + 1)
+    y[1:] = local.ravel()[:n]
+    return y
+
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     """Calculate MACD (Moving Average Convergence Divergence)"""
-    ema_fast = prices.ewm(span=fast).mean()
-    ema_slow = prices.ewm(span=slow).mean()
+    ema_fast = prices.ewm(span=fast, adjust=False).mean()
+    ema_slow = prices.ewm(span=slow, adjust=False).mean()
     macd = ema_fast - ema_slow
-    macd_signal = macd.ewm(span=signal).mean()
+    macd_signal = macd.ewm(span=signal, adjust=False).mean()
     macd_histogram = macd - macd_signal
     return macd, macd_signal, macd_histogram
+
+# --------------------------
+# Indicator-specific ops
+# --------------------------
+@register_op("rsi")
+def _rsi_op(delta, period=14, method="sma"):
+    return rsi_from_delta(delta, period, method)
+
+@register_op("true_range")
+def _true_range(high, low, close):
+    prev_close = np.empty(len(close))
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax skips the missing previous close on the first bar
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+@register_op("obv")
+def _obv(delta, volume):
+    return np.cumsum(np.sign(np.nan_to_num(delta)) * volume)
+
+# --------------------------
+# Indicator registry
+# --------------------------
+# Every EMA uses adjust=False, so equal spans resolve to the same graph node
+CLOSE, HIGH, LOW, VOLUME = column("Close"), column("High"), column("Low"), column("Volume")
+CLOSE_DELTA = Node("diff", CLOSE)
+
+def _ema(src, span):
+    return Node("ewm_mean", src, span=span, adjust=False)
+
+def _macd(options):
+    return Node("sub", _ema(CLOSE, 12), _ema(CLOSE, 26))
+
+def _macd_signal(options):
+    return _ema(_macd(options), 9)
+
+def _bollinger(scale):
+    return lambda options: Node("add_scaled", Node("rolling_mean", CLOSE, window=20),
+                                Node("rolling_std", CLOSE, window=20), scale=scale)
+
+register_indicator("SMA_20", lambda options: Node("rolling_mean", CLOSE, window=20), group="sma")
+register_indicator("SMA_50", lambda options: Node("rolling_mean", CLOSE, window=50), group="sma")
+register_indicator("EMA_20", lambda options: _ema(CLOSE, 20), group="ema")
+register_indicator("RSI", lambda options: Node("rsi", CLOSE_DELTA, period=14,
+                                               method=options.get("rsi_method", "sma")), group="rsi")
+register_indicator("MACD", _macd, group="macd")
+register_indicator("Signal_Line", _macd_signal, group="macd")
+register_indicator("MACD_Histogram", lambda options: Node("sub", _macd(options), _macd_signal(options)), group="macd")
+register_indicator("BB_Upper", _bollinger(2.0), group="bollinger")
+register_indicator("BB_Middle", lambda options: Node("rolling_mean", CLOSE, window=20), group="bollinger")
+register_indicator("BB_Lower", _bollinger(-2.0), group="bollinger")
+register_indicator("ATR", lambda options: Node("ewm_mean", Node("true_range", HIGH, LOW, CLOSE),
+                                               alpha=1 / 14, adjust=False), group="atr")
+register_indicator("OBV", lambda options: Node("obv", CLOSE_DELTA, VOLUME), group="obv")
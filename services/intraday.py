@@ -0,0 +1,90 @@
+# services/intraday.py
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config import INTRADAY_BUFFER_BARS, INTRADAY_POLL_SECONDS
+from services.alphavantage_api import OHLCV_COLUMNS, fetch_intraday_data
+from services.streaming_indicators import StreamingIndicators
+
+# Indicator columns produced per bar by StreamingIndicators.update
+STREAMING_COLUMNS = ["SMA_20", "SMA_50", "EMA_20", "RSI", "MACD", "Signal_Line", "MACD_Histogram"]
+
+class RingBuffer:
+    """
+    Fixed-capacity table of the newest rows: preallocated arrays written in
+    a circle, so appending never reallocates and memory stays bounded.
+    """
+
+    def __init__(self, capacity, columns):
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self.columns = list(columns)
+        self.index = np.empty(capacity, dtype="datetime64[ns]")
+        self.values = np.full((capacity, len(self.columns)), np.nan)
+        self.appended = 0
+
+    def __len__(self):
+        return min(self.appended, self.capacity)
+
+    def append(self, timestamps, values):
+        """Append rows (timestamps and a 2-D values block), dropping the oldest beyond capacity"""
+        timestamps = np.asarray(timestamps, dtype="datetime64[ns]")[-self.capacity:]
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        positions = (self.appended + np.arange(len(timestamps))) % self.capacity
+        self.index[positions] = timestamps
+        self.values[positions] = values
+        self.appended += len(timestamps)
+
+    def last_timestamp(self):
+        if not self.appended:
+            return None
+        return pd.Timestamp(self.index[(self.appended - 1) % self.capacity])
+
+    def frame(self):
+        """The buffered rows as a DataFrame, oldest first"""
+        order = (self.appended - len(self) + np.arange(len(self))) % self.capacity
+        return pd.DataFrame(self.values[order], index=pd.DatetimeIndex(self.index[order]), columns=self.columns)
+
+class IntradayFeed:
+    """
+    Live intraday bars of one symbol and interval. Each `poll` requests only
+    the bars after the last buffered one, runs them through streaming
+    indicators (O(1) per bar) and appends them to a ring buffer. Polls closer
+    together than `min_poll_seconds` are skipped, so any number of viewers
+    share one request rate. `rsi_method` selects the RSI smoothing, as in
+    `add_indicators`.
+    """
+
+    def __init__(self, symbol, interval="5min", capacity=INTRADAY_BUFFER_BARS,
+                 min_poll_seconds=INTRADAY_POLL_SECONDS, client=None, rsi_method="sma"):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.min_poll_seconds = min_poll_seconds
+        self.client = client
+        self.buffer = RingBuffer(capacity, OHLCV_COLUMNS + STREAMING_COLUMNS)
+        self.indicators = StreamingIndicators(rsi_method=rsi_method)
+        self.last_poll = None
+        self._lock = threading.Lock()
+
+    def poll(self, force=False):
+        """Fetch and append bars newer than the buffer; returns how many were added"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.last_poll is not None and now - self.last_poll < self.min_poll_seconds:
+                return 0
+            self.last_poll = now
+            bars = fetch_intraday_data(self.symbol, self.interval, after=self.buffer.last_timestamp(),
+                                       client=self.client)
+            if bars.empty:
+                return 0
+            rows = [self.indicators.update(close) for close in bars["Close"].to_numpy()]
+            indicators = np.array([[row[name] for name in STREAMING_COLUMNS] for row in rows])
+            self.buffer.append(bars.index.to_numpy(), np.column_stack([bars[OHLCV_COLUMNS].to_numpy(), indicators]))
+            return len(bars)
+
+    def frame(self):
+        """Buffered bars with their indicator columns, oldest first"""
+        with self._lock:
+            return self.buffer.frame()
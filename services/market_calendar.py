@@ -0,0 +1,30 @@
+# services/market_calendar.py
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+import pandas as pd
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_CLOSE = time(16, 0)
+
+def _market_now(now=None):
+    """Return `now` (or the current time) in exchange local time"""
+    if now is None:
+        return datetime.now(MARKET_TZ)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=MARKET_TZ)
+    return now.astimezone(MARKET_TZ)
+
+def last_completed_trading_day(now=None):
+    """Date of the most recent weekday session that has already closed"""
+    now = _market_now(now)
+    day = now.date()
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return pd.Timestamp(day)
+
+def last_market_close(now=None):
+    """Timezone-aware timestamp of the most recent session close"""
+    day = last_completed_trading_day(now)
+    return datetime.combine(day.date(), MARKET_CLOSE, tzinfo=MARKET_TZ)
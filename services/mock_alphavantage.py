@@ -0,0 +1,294 @@
+# services/mock_alphavantage.py
+"""
+Local stand-in for the Alpha Vantage query endpoint, for offline runs,
+benchmarks and load tests.
+
+    python services/mock_alphavantage.py serve --port 8765 --latency 0.2 --calls-per-minute 5
+    ALPHAVANTAGE_BASE_URL=http://127.0.0.1:8765/query streamlit run dashboard/app.py
+
+TIME_SERIES_DAILY and TIME_SERIES_INTRADAY are answered from recorded
+payloads (`record` writes them from the live API) or, for symbols without
+one, from a random walk seeded by the symbol, so every run serves the same
+bars. Latency, rate-limit `Note`s and failures can be injected.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from services.alphavantage_api import INTRADAY_INTERVALS, AlphaVantageClient
+from services.market_calendar import last_completed_trading_day
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fixtures")
+
+COMPACT_BARS = 100
+FULL_DAILY_BARS = 5000  # about 20 years
+FULL_INTRADAY_DAYS = 30  # window of TIME_SERIES_INTRADAY's full output
+
+RATE_LIMIT_NOTE = ("Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute "
+                   "and 500 calls per day. Please visit https://www.alphavantage.co/premium/ if you would like "
+                   "to target a higher API call frequency.")
+
+def fixture_path(root, function, symbol, interval=None):
+    """Recorded payload of one request, e.g. TIME_SERIES_INTRADAY_AAPL_5min.json"""
+    name = "_".join(part for part in (function, symbol.upper(), interval) if part)
+    return os.path.join(root, f"{name}.json")
+
+def record_fixtures(symbols, root=FIXTURES_DIR, intervals=(), client=None):
+    """Save the full daily (and intraday) payloads of `symbols` from the API for replay"""
+    client = client or AlphaVantageClient()
+    os.makedirs(root, exist_ok=True)
+    for symbol in symbols:
+        requests = [("TIME_SERIES_DAILY", None)] + [("TIME_SERIES_INTRADAY", interval) for interval in intervals]
+        for function, interval in requests:
+            params = {"function": function, "symbol": symbol, "outputsize": "full"}
+            if interval:
+                params["interval"] = interval
+            with open(fixture_path(root, function, symbol, interval), "w") as f:
+                json.dump(client.query(**params), f)
+
+def _random_walk(symbol, n, sigma, seed):
+    rng = np.random.default_rng([zlib.crc32(symbol.encode()), seed])
+    close = rng.uniform(20, 500) * np.exp(np.cumsum(rng.normal(sigma / 50, sigma, n)))
+    open_ = close * (1 + rng.normal(0, sigma / 4, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, sigma / 3, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, sigma / 3, n)))
+    volume = rng.integers(100_000, 20_000_000, n)
+    return open_, high, low, close, volume
+
+def _series(stamps, bars):
+    """Raw timestamp -> bar mapping, newest first, formatted like the API"""
+    columns = [np.char.mod("%.4f", values) for values in bars[:4]] + [bars[4].astype(str)]
+    rows = zip(stamps, *columns)
+    return {stamp: {"1. open": o, "2. high": h, "3. low": l, "4. close": c, "5. volume": v}
+            for stamp, o, h, l, c, v in reversed(list(rows))}
+
+def synthetic_daily(symbol, end, seed=0):
+    """Full synthetic TIME_SERIES_DAILY payload ending on `end`"""
+    index = pd.bdate_range(end=end, periods=FULL_DAILY_BARS)
+    series = _series(index.strftime("%Y-%m-%d"), _random_walk(symbol, len(index), 0.015, seed))
+    return {"Meta Data": {"1. Information": "Daily Prices (open, high, low, close) and Volumes",
+                          "2. Symbol": symbol, "3. Last Refreshed": next(iter(series)),
+                          "4. Output Size": "Full size", "5. Time Zone": "US/Eastern"},
+            "Time Series (Daily)": series}
+
+def synthetic_intraday(symbol, interval, end, seed=0):
+    """Full synthetic TIME_SERIES_INTRADAY payload of the regular sessions up to `end`"""
+    minutes = int(interval.removesuffix("min"))
+    days = pd.bdate_range(end=end, periods=FULL_INTRADAY_DAYS)
+    # Bar start times of the 09:30-16:00 session
+    offsets = np.arange(9 * 60 + 30, 16 * 60, minutes).astype("timedelta64[m]")
+    index = pd.DatetimeIndex((days.to_numpy()[:, None] + offsets[None, :]).ravel())
+    bars = _random_walk(symbol, len(index), 0.015 * np.sqrt(minutes / 390), seed)
+    series = _series(index.strftime("%Y-%m-%d %H:%M:%S"), bars)
+    return {"Meta Data": {"1. Information": f"Intraday ({interval}) open, high, low, close prices and volume",
+                          "2. Symbol": symbol, "3. Last Refreshed": next(iter(series)), "4. Interval": interval,
+                          "5. Output Size": "Full size", "6. Time Zone": "US/Eastern"},
+            f"Time Series ({interval})": series}
+
+def _compact(payload):
+    """The newest COMPACT_BARS entries of a full payload"""
+    key = next(key for key in payload if key.startswith("Time Series"))
+    newest = sorted(payload[key], reverse=True)[:COMPACT_BARS]
+    meta = {**payload.get("Meta Data", {})}
+    for name in meta:
+        if name.endswith("Output Size"):
+            meta[name] = "Compact"
+    return {"Meta Data": meta, key: {stamp: payload[key][stamp] for stamp in newest}}
+
+class MockAlphaVantage:
+    """
+    Threaded HTTP server answering Alpha Vantage queries at `url`.
+
+    - `latency` seconds (plus up to `jitter`) are added to every response.
+    - Above `calls_per_minute` (0 = unlimited) requests get the rate-limit
+      `Note`, as does every `note_every`-th request.
+    - Every `error_every`-th request fails with HTTP 503, and symbols in
+      `error_symbols` get the API's `Error Message`.
+
+    Synthetic series end on `end` (default: the last completed session),
+    so the dashboard's cache treats them as fresh.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, fixtures=FIXTURES_DIR, latency=0.0, jitter=0.0,
+                 calls_per_minute=0, note_every=0, error_every=0, error_symbols=(), end=None, seed=0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.calls_per_minute = calls_per_minute
+        self.note_every = note_every
+        self.error_every = error_every
+        self.error_symbols = {symbol.upper() for symbol in error_symbols}
+        self.end = pd.Timestamp(end) if end is not None else last_completed_trading_day()
+        self.seed = seed
+        self.counts = {"requests": 0, "served": 0, "notes": 0, "errors": 0}
+        self._bodies = {}
+        self._recent = deque()
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/query"
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                request = urlparse(self.path)
+                if request.path != "/query":
+                    status, body = 404, b'{"Error Message": "Not found"}'
+                else:
+                    status, body = mock.respond({k: v[-1] for k, v in parse_qs(request.query).items()})
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _body(self, function, symbol, interval, outputsize):
+        """Encoded response of one series, from its fixture if recorded (built once, then kept)"""
+        key = (function, symbol, interval, outputsize)
+        with self._lock:
+            if key in self._bodies:
+                return self._bodies[key]
+        path = fixture_path(self.fixtures, function, symbol, interval) if self.fixtures else None
+        if path and os.path.exists(path):
+            with open(path) as f:
+                payload = json.load(f)
+        elif function == "TIME_SERIES_DAILY":
+            payload = synthetic_daily(symbol, self.end, self.seed)
+        else:
+            payload = synthetic_intraday(symbol, interval, self.end, self.seed)
+        body = json.dumps(payload if outputsize == "full" else _compact(payload)).encode()
+        with self._lock:
+            self._bodies[key] = body
+        return body
+
+    def _throttled(self, now):
+        """Count the request against the per-minute budget; True when it is over budget"""
+        while self._recent and now - self._recent[0] >= 60:
+            self._recent.popleft()
+        if self.calls_per_minute and len(self._recent) >= self.calls_per_minute:
+            return True
+        self._recent.append(now)
+        return False
+
+    def respond(self, params):
+        """(HTTP status, JSON body) of one query"""
+        with self._lock:
+            self.counts["requests"] += 1
+            n = self.counts["requests"]
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            throttled = self._throttled(time.monotonic())
+        if delay:
+            time.sleep(delay)
+
+        function = params.get("function")
+        symbol = params.get("symbol", "").upper()
+        interval = params.get("interval")
+        if self.error_every and n % self.error_every == 0:
+            return self._reply("errors", 503, {"Error Message": "Service temporarily unavailable"})
+        if throttled or (self.note_every and n % self.note_every == 0):
+            return self._reply("notes", 200, {"Note": RATE_LIMIT_NOTE})
+        if not params.get("apikey"):
+            return self._reply("errors", 200, {"Error Message": "the parameter apikey is invalid or missing."})
+        if (function not in ("TIME_SERIES_DAILY", "TIME_SERIES_INTRADAY") or not symbol or symbol in self.error_symbols
+                or (function == "TIME_SERIES_INTRADAY" and interval not in INTRADAY_INTERVALS)):
+            return self._reply("errors", 200, {
+                "Error Message": "Invalid API call. Please retry or visit the documentation "
+                                 f"(https://www.alphavantage.co/documentation/) for {function}."})
+
+        outputsize = "full" if params.get("outputsize") == "full" else "compact"
+        body = self._body(function, symbol, interval if function == "TIME_SERIES_INTRADAY" else None, outputsize)
+        return self._reply("served", 200, body)
+
+    def _reply(self, outcome, status, payload):
+        with self._lock:
+            self.counts[outcome] += 1
+        return status, payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+
+    def stats(self):
+        """Requests received and how many were served, answered with a `Note` or failed"""
+        with self._lock:
+            return dict(self.counts)
+
+    def start(self):
+        """Serve from a background thread; returns self"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-alphavantage", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Answer queries until interrupted")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory of recorded payloads")
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, at random")
+    serve.add_argument("--calls-per-minute", type=int, default=0, help="Rate-limit budget (0 = unlimited)")
+    serve.add_argument("--note-every", type=int, default=0, help="Answer every Nth request with a Note")
+    serve.add_argument("--error-every", type=int, default=0, help="Fail every Nth request with HTTP 503")
+    serve.add_argument("--error-symbols", default="", help="Comma-separated symbols answered with an Error Message")
+    serve.add_argument("--end", default=None, help="Last date of synthetic series (default: last session)")
+    serve.add_argument("--seed", type=int, default=0)
+    record = commands.add_parser("record", help="Save live API payloads as fixtures")
+    record.add_argument("symbols", nargs="+")
+    record.add_argument("--fixtures", default=FIXTURES_DIR)
+    record.add_argument("--intervals", default="", help="Comma-separated intraday intervals to record too")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record_fixtures(args.symbols, args.fixtures, [i for i in args.intervals.split(",") if i])
+        print(f"Recorded {len(args.symbols)} symbols to {args.fixtures}")
+        return 0
+
+    mock = MockAlphaVantage(args.host, args.port, args.fixtures, args.latency, args.jitter, args.calls_per_minute,
+                            args.note_every, args.error_every, [s for s in args.error_symbols.split(",") if s],
+                            args.end, args.seed)
+    print(f"Serving Alpha Vantage stand-in at {mock.url} (set ALPHAVANTAGE_BASE_URL to use it)")
+    try:
+        mock._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock._server.server_close()
+        print(mock.stats())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
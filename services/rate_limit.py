@@ -0,0 +1,81 @@
+# services/rate_limit.py
+import threading
+import time
+
+class RateLimitError(Exception):
+    """Raised when Alpha Vantage answers with its rate-limit `Note`"""
+
+class BudgetExhaustedError(RateLimitError):
+    """Raised instead of waiting when the next request is further away than a limiter's `max_wait`"""
+
+class TokenBucket:
+    """Thread-safe token bucket: `capacity` tokens refilled evenly over `period` seconds"""
+
+    def __init__(self, capacity, period, clock=time.monotonic):
+        self.capacity = float(capacity)
+        self.rate = capacity / period
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available; otherwise return the seconds to wait"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def refund(self):
+        """Return a token taken by `try_acquire` that went unused"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server reports that the limit was hit"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+class RateLimiter:
+    """
+    Combined per-minute and per-day request budget for the Alpha Vantage
+    account. Waits longer than `max_wait` seconds (in practice: the daily
+    budget is spent) raise `BudgetExhaustedError` instead of blocking.
+    """
+
+    def __init__(self, per_minute, per_day=None, clock=time.monotonic, sleep=time.sleep, max_wait=60.0):
+        self.buckets = [TokenBucket(per_minute, 60.0, clock)]
+        if per_day:
+            self.buckets.append(TokenBucket(per_day, 86400.0, clock))
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until every bucket has granted a token"""
+        # Serialised so a waiting thread can't take a token from one bucket and
+        # then starve on the other while holding it
+        with self._lock:
+            granted = []
+            for bucket in self.buckets:
+                wait = bucket.try_acquire()
+                while wait > 0:
+                    if wait > self.max_wait:
+                        for taken in granted:
+                            taken.refund()
+                        raise BudgetExhaustedError(f"API request budget exhausted; next request allowed in {wait:.0f}s")
+                    self._sleep(wait)
+                    wait = bucket.try_acquire()
+                granted.append(bucket)
+
+    def penalize(self):
+        """Back off the per-minute budget after a rate-limit response"""
+        self.buckets[0].drain()
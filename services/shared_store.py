@@ -0,0 +1,125 @@
+# services/shared_store.py
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+import pandas as pd
+from config import SHARED_STORE_MB
+
+def _nbytes(value):
+    """Approximate memory held by a stored value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(_nbytes(getattr(value, field.name)) for field in dataclasses.fields(value))
+    if callable(getattr(value, "arrays", None)):
+        return _nbytes(value.arrays())
+    return sys.getsizeof(value)
+
+class SharedStore:
+    """
+    Process-wide results shared by every session, with single-flight
+    semantics: concurrent requests for a key that is being computed wait for
+    that one computation instead of starting their own. Entries are evicted
+    least-recently-used first once they exceed `max_bytes`.
+
+    Values are handed out as-is to every caller, so they must be treated as
+    read-only; a stage that modifies a stored frame must copy it first.
+    """
+
+    def __init__(self, max_bytes=SHARED_STORE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _flight(self, key, fn, args, kwargs, store):
+        """Run `fn` once per key at a time; callers arriving meanwhile share its outcome"""
+        with self._lock:
+            if store and key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            value = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            flight.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if store:
+                self._insert(key, value)
+        flight.set_result(value)
+        return value
+
+    def get_or_compute(self, key, fn, *args, **kwargs):
+        """Stored value for `key`, computing and storing `fn(*args, **kwargs)` on a miss"""
+        return self._flight(key, fn, args, kwargs, store=True)
+
+    def coalesce(self, key, fn, *args, **kwargs):
+        """Single-flight call of `fn` whose result is not kept (e.g. a network fetch with its own cache)"""
+        return self._flight(key, fn, args, kwargs, store=False)
+
+    def _insert(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def invalidate(self, predicate=None):
+        """Drop every entry (or those whose key matches `predicate`); returns how many"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate is None or predicate(key)]
+            for key in keys:
+                self.bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def stats(self):
+        """Counters plus `saved`: calls answered without running the function again"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                    "saved": self.hits + self.coalesced, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def get_shared_store():
+    """The process-wide store shared by every dashboard session"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SharedStore()
+        return _default_store
@@ -0,0 +1,77 @@
+# services/signal_store.py
+import glob
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from config import SIGNALS_DIR
+
+# Key of the store's own entry in the Parquet schema metadata
+META_KEY = b"signal_store"
+
+def history_path(symbol, outputsize="compact", root=SIGNALS_DIR):
+    """Hive-style partition holding one symbol's indicator and signal history"""
+    return os.path.join(root, "history", f"outputsize={outputsize}", f"symbol={symbol.upper()}", "part-0.parquet")
+
+def screen_path(run_date, outputsize="compact", root=SIGNALS_DIR):
+    """Partition holding the latest-signal table of one batch run"""
+    return os.path.join(root, "screens", f"outputsize={outputsize}", f"run_date={run_date}", "part-0.parquet")
+
+def _write(path, df, meta, preserve_index=True):
+    """Write a frame with `meta` in the schema metadata, swapping the file in atomically"""
+    table = pa.Table.from_pandas(df, preserve_index=preserve_index)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), META_KEY: json.dumps(meta).encode()})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+def read_meta(path):
+    """Store metadata of a Parquet file, or {} if it is missing or unreadable"""
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata.get(META_KEY, b"{}"))
+    except (OSError, ValueError, pa.ArrowException):
+        return {}
+
+def write_history(symbol, outputsize, df, root=SIGNALS_DIR, **meta):
+    """Store a symbol's frame (prices, indicators, signals); `meta` records how it was built"""
+    meta = {"symbol": symbol.upper(), "outputsize": outputsize, "rows": len(df),
+            "columns": list(df.columns), **meta}
+    _write(history_path(symbol, outputsize, root), df, meta)
+
+def read_history(symbol, outputsize="compact", columns=None, root=SIGNALS_DIR, **expected):
+    """
+    Return (df, meta) for a stored symbol, reading only `columns` if given.
+    Keyword arguments must match the stored metadata (e.g. `fetched_at=...`).
+    Returns (None, {}) when nothing matching is stored or a column is missing.
+    """
+    path = history_path(symbol, outputsize, root)
+    meta = read_meta(path)
+    if not meta or any(meta.get(key) != value for key, value in expected.items()):
+        return None, {}
+    if columns is not None and not set(columns) <= set(meta.get("columns", ())):
+        return None, {}
+    try:
+        return pd.read_parquet(path, columns=None if columns is None else list(columns)), meta
+    except (OSError, ValueError, pa.ArrowException):
+        return None, {}
+
+def write_screen(run_date, outputsize, table, root=SIGNALS_DIR, **meta):
+    _write(screen_path(run_date, outputsize, root), table,
+           {"run_date": str(run_date), "outputsize": outputsize, **meta}, preserve_index=False)
+
+def read_screen(outputsize="compact", run_date=None, root=SIGNALS_DIR):
+    """The latest-signal table of `run_date` (default: the most recent run), or None"""
+    if run_date is None:
+        runs = sorted(glob.glob(screen_path("*", outputsize, root)))
+        if not runs:
+            return None
+        path = runs[-1]
+    else:
+        path = screen_path(run_date, outputsize, root)
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError, pa.ArrowException):
+        return None
@@ -0,0 +1,226 @@
+# services/streaming_indicators.py
+import math
+import numbers
+from collections import deque
+import numpy as np
+from services.indicators import RSI_METHODS
+
+class RollingMean:
+    """
+    O(1) rolling mean that follows pandas' `rolling(window).mean()` arithmetic
+    (Kahan-compensated add/remove), so results match the batch version.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.sum = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.neg_ct = 0
+        self.same_ct = 0
+        self.prev = math.nan
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            y = -old - self.comp_remove
+            t = self.sum + y
+            self.comp_remove = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, old) < 0:
+                self.neg_ct -= 1
+
+        self.values.append(value)
+        y = value - self.comp_add
+        t = self.sum + y
+        self.comp_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        self.same_ct = self.same_ct + 1 if value == self.prev else 1
+        self.prev = value
+
+        nobs = len(self.values)
+        if nobs < self.window:
+            return math.nan
+        if self.same_ct >= nobs:
+            return self.prev
+        result = self.sum / nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == nobs and result > 0:
+            return 0.0
+        return result
+
+    def snapshot(self):
+        return {"window": self.window, "values": list(self.values), "sum": self.sum,
+                "comp_add": self.comp_add, "comp_remove": self.comp_remove,
+                "neg_ct": self.neg_ct, "same_ct": self.same_ct, "prev": self.prev}
+
+    @classmethod
+    def restore(cls, state):
+        obj = cls(state["window"])
+        obj.values = deque(state["values"])
+        for key in ("sum", "comp_add", "comp_remove", "neg_ct", "same_ct", "prev"):
+            setattr(obj, key, state[key])
+        return obj
+
+class WilderMean:
+    """
+    O(1) Wilder smoothing following `_wilder_average`: the first value (the
+    undefined first move) is skipped, the next `period` values seed a simple
+    mean, then avg += (x - avg) / period.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.sum = 0.0
+        self.avg = math.nan
+
+    def update(self, value):
+        self.count += 1
+        if self.count == 1:
+            return math.nan
+        if self.count <= self.period:
+            self.sum += value
+            return math.nan
+        if self.count == self.period + 1:
+            self.avg = (self.sum + value) / self.period
+        else:
+            self.avg += (value - self.avg) / self.period
+        return self.avg
+
+    def snapshot(self):
+        return {"period": self.period, "count": self.count, "sum": self.sum, "avg": self.avg}
+
+    @classmethod
+    def restore(cls, state):
+        obj = cls(state["period"])
+        obj.count = state["count"]
+        obj.sum = state["sum"]
+        obj.avg = state["avg"]
+        return obj
+
+class EWMean:
+    """O(1) exponentially weighted mean matching pandas' `ewm(span, adjust).mean()`"""
+
+    def __init__(self, span, adjust=True):
+        self.span = span
+        self.adjust = adjust
+        com = (span - 1) / 2.0
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.weighted = math.nan
+        self.old_wt = 1.0
+
+    def update(self, value):
+        if math.isnan(self.weighted):
+            self.weighted = value
+            return value
+        self.old_wt *= self.old_wt_factor
+        if self.weighted != value:
+            self.weighted = (self.old_wt * self.weighted + self.new_wt * value) / (self.old_wt + self.new_wt)
+        self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.0
+        return self.weighted
+
+    def snapshot(self):
+        return {"span": self.span, "adjust": self.adjust, "weighted": self.weighted, "old_wt": self.old_wt}
+
+    @classmethod
+    def restore(cls, state):
+        obj = cls(state["span"], state["adjust"])
+        obj.weighted = state["weighted"]
+        obj.old_wt = state["old_wt"]
+        return obj
+
+class StreamingIndicators:
+    """
+    Stateful per-symbol counterpart of `add_indicators`.
+
+    `update(bar)` consumes one close and returns that bar's SMA_20, SMA_50,
+    EMA_20, RSI and MACD values in constant time; `rsi_method` is "sma" or
+    "wilder", as in `calculate_rsi`. `snapshot()` returns plain
+    JSON-serialisable state and `restore()` rebuilds the engine from it.
+    """
+
+    def __init__(self, rsi_period=14, macd_fast=12, macd_slow=26, macd_signal=9, rsi_method="sma"):
+        if rsi_method not in RSI_METHODS:
+            raise ValueError(f"Unknown RSI method {rsi_method!r}, expected one of {RSI_METHODS}")
+        self.rsi_method = rsi_method
+        self.sma_20 = RollingMean(20)
+        self.sma_50 = RollingMean(50)
+        self.ema_20 = EWMean(20, adjust=False)
+        averager = WilderMean if rsi_method == "wilder" else RollingMean
+        self.rsi_gain = averager(rsi_period)
+        self.rsi_loss = averager(rsi_period)
+        self.macd_fast = EWMean(macd_fast, adjust=False)
+        self.macd_slow = EWMean(macd_slow, adjust=False)
+        self.macd_signal = EWMean(macd_signal, adjust=False)
+        self.last_close = math.nan
+        self.last_timestamp = None
+
+    def update(self, bar, timestamp=None):
+        """Feed one bar (a close, or a mapping/Series with 'Close') and return its indicator row"""
+        close = float(bar if isinstance(bar, numbers.Real) else bar["Close"])
+        if timestamp is not None:
+            self.last_timestamp = str(timestamp)
+
+        # Same conventions as calculate_rsi: the first delta counts as no move
+        # (and is left out of the Wilder seed)
+        delta = close - self.last_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self.last_close = close
+        avg_gain = self.rsi_gain.update(gain)
+        avg_loss = self.rsi_loss.update(loss)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(avg_gain) / avg_loss
+            rsi = float(100 - (100 / (1 + rs)))
+        if avg_loss == 0 and avg_gain == 0:
+            rsi = 50.0
+
+        macd = self.macd_fast.update(close) - self.macd_slow.update(close)
+        signal = self.macd_signal.update(macd)
+        return {
+            "SMA_20": self.sma_20.update(close),
+            "SMA_50": self.sma_50.update(close),
+            "EMA_20": self.ema_20.update(close),
+            "RSI": rsi,
+            "MACD": macd,
+            "Signal_Line": signal,
+            "MACD_Histogram": macd - signal,
+        }
+
+    def update_many(self, closes):
+        """Replay a sequence of closes (e.g. to warm up from stored history); returns the last row"""
+        row = None
+        for close in closes:
+            row = self.update(close)
+        return row
+
+    def snapshot(self):
+        return {
+            "last_close": self.last_close,
+            "last_timestamp": self.last_timestamp,
+            "rsi_method": self.rsi_method,
+            "rolling": {name: getattr(self, name).snapshot() for name in ("sma_20", "sma_50")},
+            "rsi": {name: getattr(self, name).snapshot() for name in ("rsi_gain", "rsi_loss")},
+            "ewm": {name: getattr(self, name).snapshot() for name in ("ema_20", "macd_fast", "macd_slow", "macd_signal")},
+        }
+
+    @classmethod
+    def restore(cls, state):
+        obj = cls(rsi_method=state["rsi_method"])
+        obj.last_close = state["last_close"]
+        obj.last_timestamp = state.get("last_timestamp")
+        for name, sub in state["rolling"].items():
+            setattr(obj, name, RollingMean.restore(sub))
+        averager = WilderMean if obj.rsi_method == "wilder" else RollingMean
+        for name, sub in state["rsi"].items():
+            setattr(obj, name, averager.restore(sub))
+        for name, sub in state["ewm"].items():
+            setattr(obj, name, EWMean.restore(sub))
+        return obj
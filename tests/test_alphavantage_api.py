@@ -0,0 +1,101 @@
+# tests/test_alphavantage_api.py
+import os
+import sys
+from datetime import datetime, timezone
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import alphavantage_api
+from services.alphavantage_api import AlphaVantageClient, fetch_daily_data, update_daily_history
+from services.batch_fetch import fetch_many
+from services.cache import OHLCVCache
+from services.mock_alphavantage import MockAlphaVantage
+from services.rate_limit import BudgetExhaustedError, RateLimiter, RateLimitError
+
+END = "2024-06-28"
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """A scratch OHLCV cache, so every test starts cold"""
+    store = OHLCVCache(str(tmp_path))
+    monkeypatch.setattr(alphavantage_api, "_cache", store)
+    return store
+
+def _mock(**options):
+    return MockAlphaVantage(fixtures=None, end=END, **options)
+
+def _client(mock, **options):
+    return AlphaVantageClient(api_key="test", base_url=mock.url, backoff_factor=0, **options)
+
+def test_retries_server_errors():
+    # Every second request fails with 503; the transport retries it
+    with _mock(error_every=2) as mock, _client(mock) as client:
+        assert len(client.daily_series("AAA")) == 100
+        assert len(client.daily_series("BBB")) == 100
+        assert mock.stats() == {"requests": 3, "served": 2, "notes": 0, "errors": 1}
+
+def test_rate_limit_note_raises():
+    with _mock(note_every=1) as mock, _client(mock) as client:
+        with pytest.raises(RateLimitError):
+            client.daily_series("AAA")
+
+def test_fetch_many_retries_rate_limit_notes():
+    symbols = ["AAA", "BBB", "CCC", "DDD"]
+    # Every second request is answered with the rate-limit Note
+    with _mock(note_every=2) as mock, _client(mock) as client:
+        results = {symbol: (df, error) for symbol, df, error in fetch_many(symbols, client=client, backoff=0)}
+        assert sorted(results) == symbols
+        assert all(error is None and len(df) == 100 for df, error in results.values())
+        assert mock.stats() == {"requests": 7, "served": 4, "notes": 3, "errors": 0}
+
+def test_budget_exhausted_raises_without_requesting():
+    slept = []
+    limiter = RateLimiter(per_minute=5, per_day=2, sleep=slept.append, max_wait=1.0)
+    with _mock() as mock, _client(mock, limiter=limiter) as client:
+        client.daily_series("AAA")
+        client.daily_series("BBB")
+        with pytest.raises(BudgetExhaustedError):
+            client.daily_series("CCC")
+        assert mock.stats()["requests"] == 2
+    assert slept == []
+
+def test_fetch_many_stops_on_exhausted_budget():
+    limiter = RateLimiter(per_minute=5, per_day=1, max_wait=1.0)
+    with _mock() as mock, _client(mock, limiter=limiter) as client:
+        results = list(fetch_many(["AAA", "BBB"], max_workers=1, client=client, backoff=60.0))
+        errors = [error for _, _, error in results if error is not None]
+        assert len(errors) == 1 and isinstance(errors[0], BudgetExhaustedError)
+        assert mock.stats()["requests"] == 1
+
+def test_fetch_many_coalesces_duplicate_symbols():
+    with _mock() as mock, _client(mock) as client:
+        results = list(fetch_many(["AAA", "BBB", "AAA", "BBB", "AAA"], client=client))
+        assert sorted(symbol for symbol, _, _ in results) == ["AAA", "BBB"]
+        assert mock.stats()["requests"] == 2
+
+def test_update_daily_history_appends_and_revises():
+    with _mock() as mock, _client(mock) as client:
+        latest = fetch_daily_data("AAA", "compact", use_cache=False, client=client)
+        stored = latest.iloc[:-5].copy()
+        # A provisional close that the next compact response revises
+        stored.iloc[-1, stored.columns.get_loc("Close")] += 1.0
+        merged = update_daily_history("AAA", stored, client)
+    pd.testing.assert_frame_equal(merged, latest)
+
+def test_update_daily_history_up_to_date_and_too_old():
+    with _mock() as mock, _client(mock) as client:
+        full = fetch_daily_data("AAA", "full", use_cache=False, client=client)
+        # Only the last stored bar is rewritten, with the same values
+        pd.testing.assert_frame_equal(update_daily_history("AAA", full, client), full)
+        # The compact window doesn't reach back to this history
+        assert update_daily_history("AAA", full.iloc[:-150], client) is None
+
+def test_fetch_daily_data_updates_stale_history_with_one_compact_request(cache):
+    with _mock() as mock, _client(mock) as client:
+        full = fetch_daily_data("AAA", "full", use_cache=False, client=client)
+        cache.put("AAA", "full", full.iloc[:-3], fetched_at=datetime(2024, 6, 21, tzinfo=timezone.utc))
+        df = fetch_daily_data("AAA", "full", client=client)
+        assert mock.stats()["requests"] == 2
+    pd.testing.assert_frame_equal(df, full, check_freq=False)
@@ -0,0 +1,79 @@
+# tests/test_backtest.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.backtest import backtest_stats, run_backtest, signal_codes
+
+# Up 10% twice, down 10% twice, flat, up 10%
+CLOSE = [100.0, 110.0, 121.0, 110.0, 99.0, 99.0, 108.9]
+SIGNAL = ["BUY", "HOLD", "SELL", "HOLD", "BUY", "HOLD", "HOLD"]
+
+def _frame(close=CLOSE, signal=SIGNAL):
+    return pd.DataFrame({"Close": close, "Signal": signal},
+                        index=pd.date_range("2024-01-01", periods=len(close), freq="D"))
+
+def test_long_only_positions_and_fills():
+    result = run_backtest(_frame())
+    assert result.positions.tolist() == [1, 1, 0, 0, 1, 1, 1]
+    np.testing.assert_allclose(result.returns, [0, 0.1, 0.1, 0, 0, 0, 0.1], atol=1e-12)
+    assert result.equity.iloc[-1] == pytest.approx(10_000 * 1.1 ** 3)
+
+    trades = result.trades
+    assert trades["Side"].tolist() == ["LONG", "LONG"]
+    assert trades["Entry"].tolist() == [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-05")]
+    assert trades["Exit"].tolist() == [pd.Timestamp("2024-01-03"), pd.Timestamp("2024-01-07")]
+    assert trades["Entry_Price"].tolist() == [100.0, 99.0]
+    assert trades["Exit_Price"].tolist() == [121.0, 108.9]
+    assert trades["Bars"].tolist() == [2, 2]
+    assert trades["Open"].tolist() == [False, True]
+    np.testing.assert_allclose(trades["Return"], [0.21, 0.1])
+
+def test_long_short_goes_short_on_sell():
+    result = run_backtest(_frame(), mode="long_short")
+    assert result.positions.tolist() == [1, 1, -1, -1, 1, 1, 1]
+    np.testing.assert_allclose(result.returns, [0, 0.1, 0.1, 11 / 121, 0.1, 0, 0.1])
+    assert result.trades["Side"].tolist() == ["LONG", "SHORT", "LONG"]
+    np.testing.assert_allclose(result.trades["Return"], [0.21, 22 / 121, 0.1])
+    assert result.stats["trades"] == 3
+    assert result.stats["turnover"] == 5
+
+def test_commission_and_slippage_charged_per_unit_traded():
+    cost = 0.001 + 0.002
+    result = run_backtest(_frame(), commission=0.001, slippage=0.002)
+    np.testing.assert_allclose(result.returns, [-cost, 0.1, 1.1 * (1 - cost) - 1, 0, -cost, 0, 0.1])
+    assert result.equity.iloc[-1] == pytest.approx(10_000 * 1.1 ** 3 * (1 - cost) ** 3)
+    # Closed trades pay to get in and out, the open one only to get in
+    np.testing.assert_allclose(result.trades["Return"], [1.21 * (1 - cost) ** 2 - 1, 1.1 * (1 - cost) - 1])
+
+    short = run_backtest(_frame(), mode="long_short", commission=0.001, slippage=0.002)
+    # Reversing long to short trades two units of notional
+    assert short.returns.iloc[2] == pytest.approx(1.1 * (1 - 2 * cost) - 1)
+
+def test_hit_rate_counts_closed_trades_only():
+    # A losing and a winning round trip, then an open losing trade
+    close = [100.0, 90.0, 95.0, 100.0, 105.0, 100.0]
+    signal = ["BUY", "SELL", "BUY", "SELL", "BUY", "HOLD"]
+    result = run_backtest(_frame(close, signal))
+    assert result.trades["Open"].tolist() == [False, False, True]
+    assert result.stats["trades"] == 3
+    assert result.stats["hit_rate"] == 0.5
+
+    no_closed = run_backtest(_frame(CLOSE[:3], ["BUY", "HOLD", "HOLD"]))
+    assert np.isnan(no_closed.stats["hit_rate"])
+
+def test_backtest_stats_matches_run_backtest():
+    df = _frame()
+    for mode in ("long_only", "long_short"):
+        full = run_backtest(df, mode, commission=0.001, slippage=0.002).stats
+        fast = backtest_stats(df["Close"].to_numpy(), signal_codes(df["Signal"]), mode, 0.001, 0.002,
+                              years=(df.index[-1] - df.index[0]).days / 365.25)
+        assert fast == pytest.approx(full, nan_ok=True)
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        run_backtest(_frame(), mode="short_only")
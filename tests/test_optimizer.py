@@ -0,0 +1,38 @@
+# tests/test_optimizer.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.backtest import TRADING_DAYS
+from models.optimizer import optimize, prepare_inputs
+from models.walk_forward import FoldCache, walk_forward
+
+PARAMS = [{"rsi_oversold": 30}, {"rsi_oversold": 40}]
+
+def _frame(n=600, index=None, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    volume = rng.integers(100_000, 1_000_000, n).astype(float)
+    return pd.DataFrame({"Close": close, "Volume": volume}, index=index)
+
+def test_prepare_inputs_datetime_index_uses_calendar_span():
+    df = _frame(index=pd.date_range("2020-01-01", periods=600, freq="D"))
+    inputs, years = prepare_inputs({"A": df})
+    assert len(inputs["A"]) == 600
+    assert years["A"] == pytest.approx(599 / 365.25)
+
+@pytest.mark.parametrize("index", [None, pd.Index(np.arange(600) * 2)], ids=["range", "integer"])
+def test_prepare_inputs_non_datetime_index_counts_bars(index):
+    _, years = prepare_inputs({"A": _frame(index=index)})
+    assert years["A"] == pytest.approx(600 / TRADING_DAYS)
+
+def test_optimize_and_walk_forward_accept_range_index():
+    df = _frame()
+    table = optimize({"A": df}, PARAMS, max_workers=1)
+    assert len(table) == len(PARAMS)
+    result = walk_forward(df, PARAMS, train_bars=252, test_bars=63, cache=FoldCache())
+    assert len(result.folds) == 5
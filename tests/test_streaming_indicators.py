@@ -0,0 +1,62 @@
+# tests/test_streaming_indicators.py
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.indicators import RSI_METHODS, add_indicators
+from services.streaming_indicators import StreamingIndicators
+
+COLUMNS = ["SMA_20", "SMA_50", "EMA_20", "RSI", "MACD", "Signal_Line", "MACD_Histogram"]
+
+def _series(kind, n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    if kind == "random":
+        return 100 + np.cumsum(rng.normal(0, 1, n))
+    if kind == "tied":
+        # Whole-dollar moves, many of them zero: repeated closes and flat windows
+        return 100 + np.cumsum(rng.integers(-1, 2, n)).astype(float)
+    if kind == "constant":
+        return np.full(n, 42.0)
+    raise ValueError(f"Unknown series {kind!r}")
+
+def _stream(closes, rsi_method, restore_at=None):
+    engine = StreamingIndicators(rsi_method=rsi_method)
+    rows = []
+    for i, close in enumerate(closes):
+        if i == restore_at:
+            # Round-trip through JSON, as a stored snapshot would
+            engine = StreamingIndicators.restore(json.loads(json.dumps(engine.snapshot())))
+        rows.append(engine.update(close))
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+@pytest.mark.parametrize("rsi_method", RSI_METHODS)
+@pytest.mark.parametrize("kind", ["random", "tied", "constant"])
+@pytest.mark.parametrize("restore_at", [None, 1, 14, 37, 150])
+def test_streaming_matches_batch(kind, rsi_method, restore_at):
+    closes = _series(kind)
+    expected = add_indicators(pd.DataFrame({"Close": closes}), rsi_method=rsi_method)
+    streamed = _stream(closes, rsi_method, restore_at)
+    for column in COLUMNS:
+        np.testing.assert_allclose(streamed[column].to_numpy(), expected[column].to_numpy(),
+                                   rtol=1e-9, atol=1e-9, err_msg=column)
+
+@pytest.mark.parametrize("rsi_method", RSI_METHODS)
+def test_flat_and_rising_rsi(rsi_method):
+    rising = _stream(np.arange(1.0, 61.0), rsi_method)["RSI"].dropna()
+    flat = _stream(np.full(60, 10.0), rsi_method)["RSI"].dropna()
+    assert (rising == 100.0).all()
+    assert (flat == 50.0).all()
+
+def test_snapshot_keeps_rsi_method():
+    engine = StreamingIndicators(rsi_method="wilder")
+    engine.update_many(_series("random", 30))
+    assert StreamingIndicators.restore(engine.snapshot()).rsi_method == "wilder"
+
+def test_unknown_rsi_method():
+    with pytest.raises(ValueError):
+        StreamingIndicators(rsi_method="ema")
@@ -0,0 +1,61 @@
+# tests/test_walk_forward.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import walk_forward as wf
+from models.walk_forward import FoldCache, walk_forward, walk_forward_folds
+
+PARAMS = [{"rsi_oversold": 30}, {"rsi_oversold": 40}]
+OPTIONS = {"train_bars": 252, "test_bars": 63}
+
+def _frame(n, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, 1200))
+    volume = rng.integers(100_000, 1_000_000, 1200).astype(float)
+    index = pd.bdate_range("2015-01-01", periods=1200)
+    # Shorter histories are prefixes of the same series, as after a refresh
+    return pd.DataFrame({"Close": close, "Volume": volume}, index=index).iloc[:n]
+
+def test_folds_are_anchored_and_complete():
+    assert walk_forward_folds(600, 252, 63) == [(s, s + 252, s + 315) for s in (0, 63, 126, 189, 252)]
+    assert walk_forward_folds(600, 252, 63, step=126) == [(0, 252, 315), (126, 378, 441), (252, 504, 567)]
+    assert walk_forward_folds(300, 252, 63) == []
+
+def test_overlapping_test_windows_rejected():
+    with pytest.raises(ValueError):
+        walk_forward_folds(600, 252, 63, step=21)
+    with pytest.raises(ValueError):
+        walk_forward(_frame(600), PARAMS, step=21, cache=FoldCache(), **OPTIONS)
+
+def test_extending_history_reuses_cached_folds():
+    cache = FoldCache()
+    short = walk_forward(_frame(600), PARAMS, cache=cache, **OPTIONS)
+    assert not short.folds["cached"].any()
+
+    extended = walk_forward(_frame(1200), PARAMS, cache=cache, **OPTIONS)
+    assert len(extended.folds) == 15
+    assert extended.folds["cached"].tolist() == [True] * 5 + [False] * 10
+    assert cache.hits == 5
+
+    # Cached folds give the same results as evaluating them again
+    fresh = walk_forward(_frame(1200), PARAMS, cache=FoldCache(), **OPTIONS)
+    pd.testing.assert_frame_equal(extended.folds.drop(columns="cached"), fresh.folds.drop(columns="cached"))
+    pd.testing.assert_series_equal(extended.returns, fresh.returns)
+    assert extended.returns.index.is_unique
+
+def test_changed_settings_miss_the_cache():
+    cache = FoldCache()
+    walk_forward(_frame(600), PARAMS, cache=cache, **OPTIONS)
+    result = walk_forward(_frame(600), PARAMS, cache=cache, commission=0.001, **OPTIONS)
+    assert not result.folds["cached"].any()
+
+def test_default_cache_persists_between_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(wf, "CACHE_DIR", str(tmp_path))
+    walk_forward(_frame(600), PARAMS, **OPTIONS)
+    assert len(os.listdir(tmp_path / "walk_forward")) == 5
+    assert walk_forward(_frame(600), PARAMS, **OPTIONS).folds["cached"].all()